@@ -3,17 +3,12 @@ Trading Dashboard — Home / Market Pulse + Sector Rotation
 Run:  streamlit run app.py
 """
 
+import bisect
+
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-from core import loader, scorer, signals, recommender, chart_utils
-
-_USE_TV = False
-try:
-    from streamlit_lightweight_charts import renderLightweightCharts
-    _USE_TV = True
-except ImportError:
-    pass
+import numpy as np
+from core import loader, scorer, signals, recommender
 
 # Session state
 if "selected_sector" not in st.session_state:
@@ -76,54 +71,88 @@ if date_range_preset == "Custom":
     to_idx = len(all_available_dates) - 1 if all_available_dates else 0
     from_date = st.sidebar.selectbox("From", all_available_dates, index=from_idx)
     to_date = st.sidebar.selectbox("To", all_available_dates, index=to_idx)
-    from_i = all_available_dates.index(from_date)
-    to_i = all_available_dates.index(to_date)
+    # all_available_dates is sorted ascending — binary search, not a linear scan
+    from_i = bisect.bisect_left(all_available_dates, from_date)
+    to_i = bisect.bisect_left(all_available_dates, to_date)
     dates = all_available_dates[from_i : to_i + 1] if from_i <= to_i else all_available_dates[to_i : from_i + 1]
 else:
     limit_map = {"Last 30 days": 30, "Last 60 days": 60, "Last 90 days": 90, "All": None}
     dates = loader.get_dates(limit=limit_map[date_range_preset])
 
-@st.cache_data(ttl=300)
-def _signal_data(date_list):
-    from collections import defaultdict
-    from core import db
-    d = defaultdict(dict)
-    for doc in db.main_coll().find({"date": {"$in": date_list}}):
-        m = db.map_fields(doc)
-        d[m["date"]][m["symbol"]] = m
-    return dict(d)
-
-sig_data = _signal_data(tuple(dates))
-
-all_df = pd.DataFrame(all_stocks)
+sig_data = loader.signal_data(dates)
+
+# Key-metric columns with explicit dtypes — from_records + astype keeps the
+# numeric columns out of the object path (None → NaN) and makes oi_trend a
+# categorical so .isin() compares integer codes, not Python objects
+_METRIC_COLS = {
+    "oi_trend": "category",
+    "pcr": "float32",
+    "change_pct": "float32",
+    "volume_times": "float32",
+    "delivery_times": "float32",
+}
+
+def _metric_df(stocks: list[dict]) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(stocks, columns=list(_METRIC_COLS))
+    return df.astype(_METRIC_COLS)
+
+def _symbol_links(col: pd.Series) -> pd.Series:
+    """Vectorized Stock Analysis deep-link column (no per-row lambda)."""
+    return "/Stock_Analysis?symbol=" + col.astype("string")
+
+# One shared link-column config (and one compiled display_text regex)
+# instead of a fresh LinkColumn per rendered table
+_SYMBOL_LINK_COL = st.column_config.LinkColumn(
+    "Symbol", display_text=r".*symbol=([^&]+)"
+)
+
 bullish_trends = scorer.BULLISH
 bearish_trends = signals.BEARISH_TRENDS
 
 # View date: pick which date to view (Alerts, Signals, Quick Picks, Key Metrics)
-dates_sorted_newest_first = list(reversed(dates)) if dates else []
 view_date = st.sidebar.selectbox(
     "View date",
-    options=dates_sorted_newest_first,
+    options=dates[::-1],
     index=0,
     format_func=lambda x: f"{x} (latest)" if dates and x == dates[-1] else x,
     help="Change to see past alerts, signals, and quick picks for that date",
     key="view_date",
 )
-dates_up_to_view = [d for d in dates if d <= view_date] if view_date else []
+# dates is sorted ascending, so a bisect slice beats a per-element scan
+dates_up_to_view = dates[: bisect.bisect_right(dates, view_date)] if view_date else []
 view_stocks = list(sig_data.get(view_date, {}).values()) if view_date else []
-view_df = pd.DataFrame(view_stocks) if view_stocks else all_df
+# Only the frame actually viewed is built — the latest-date rows are just
+# the fallback when the viewed date has no signal docs
+view_df = _metric_df(view_stocks if view_stocks else all_stocks)
+
+# One tuple key shared by every cached call below — built once per rerun
+# instead of re-tupling (and re-hashing) the list at each callsite
+dates_key = tuple(dates_up_to_view)
+
+# Flattened (date, symbol) frame shared by the summary and all alert blocks
+alert_df = signals.flatten(sig_data, dates_up_to_view)
 
 # ── Daily Summary ───────────────────────────────────────────
-summary = signals.daily_summary(sig_data, dates_up_to_view) if dates_up_to_view else "No data for selected date."
+summary = signals.daily_summary(alert_df, dates_up_to_view) if dates_up_to_view else "No data for selected date."
 st.info(summary)
 
 # ── Key Metrics (unfiltered — all stocks for view date) ─────
-n_bull = len(view_df[view_df["oi_trend"].isin(bullish_trends)]) if not view_df.empty else 0
-n_bear = len(view_df[view_df["oi_trend"].isin(bearish_trends)]) if not view_df.empty else 0
-avg_pcr = view_df["pcr"].mean() if not view_df.empty else 0
-avg_change = view_df["change_pct"].mean() if not view_df.empty else 0
-avg_vol = view_df["volume_times"].mean() if not view_df.empty else 0
-avg_dlv = view_df["delivery_times"].mean() if not view_df.empty else 0
+if view_df.empty:
+    n_bull = n_bear = 0
+    avg_pcr = avg_change = avg_vol = avg_dlv = 0.0
+else:
+    # Count bullish/bearish on the categorical codes (one integer scan
+    # instead of two object-dtype .isin passes) and take all four averages
+    # in a single reduction
+    codes = view_df["oi_trend"].cat.codes.to_numpy()
+    cats = view_df["oi_trend"].cat.categories
+    bull_codes = np.array([cats.get_loc(t) for t in bullish_trends if t in cats])
+    bear_codes = np.array([cats.get_loc(t) for t in bearish_trends if t in cats])
+    n_bull = int(np.isin(codes, bull_codes).sum())
+    n_bear = int(np.isin(codes, bear_codes).sum())
+    avg_pcr, avg_change, avg_vol, avg_dlv = view_df[
+        ["pcr", "change_pct", "volume_times", "delivery_times"]
+    ].mean()
 
 c1, c2, c3, c4, c5, c6 = st.columns(6)
 n_total = len(view_df) if not view_df.empty else 1
@@ -143,13 +172,93 @@ with fc1:
 with fc2:
     window = st.selectbox("Window", [3, 5, 10, 21], format_func=lambda x: f"{x}d", index=1, key="sector_window")
 
+# Cached wrappers keyed by (dates, filters) — sig_data itself is already
+# cached, so these only recompute when the inputs actually change instead
+# of on every widget interaction
+@st.cache_data(ttl=300)
+def _rot_cached(dates_key: tuple, window: int, mcap: str):
+    d = list(dates_key)
+    return signals.sector_rotation(loader.signal_data(d), d, window, mcap)
+
+@st.cache_data(ttl=300)
+def _top_picks_cached(dates_key: tuple, view_date: str, mcap: str, top_n: int = 7):
+    d = list(dates_key)
+    return recommender.get_top_picks(loader.signal_data(d), d, view_date, mcap, top_n=top_n)
+
+@st.cache_data(ttl=300)
+def _hist_perf_cached(dates_key: tuple, lookback_days: int = 5):
+    d = list(dates_key)
+    return recommender.get_historical_top7_performance(loader.signal_data(d), d, lookback_days=lookback_days)
+
 # ── Sector Rotation ──────────────────────────────────────────
-st.subheader(f"Sector Rotation — {mcap_filter}")
-st.caption("Click a sector row to see its stocks (same page)")
-rot = signals.sector_rotation(sig_data, dates_up_to_view, window, mcap_filter)
+# Whole-table CSS matrix, vectorized per column and cached on the frame
+# contents — widget toggles that leave rdf unchanged reuse the styles
+# instead of recomputing them. The table stays an interactive
+# st.dataframe (row-select drill-down), so we cache the styles rather
+# than rendered HTML.
+@st.cache_data(ttl=300)
+def _rot_css(rdf: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame("", index=rdf.index, columns=rdf.columns)
+    for c in [col for col in rdf.columns if "Chg" in col or "Δ" in col]:
+        arr = pd.to_numeric(rdf[c], errors="coerce").to_numpy()
+        out[c] = np.where(arr > 0, "color: #22c55e",
+                          np.where(arr < 0, "color: #ef4444", ""))
+    # OI trend direction — Improving=green, Declining=red
+    if "Direction" in rdf.columns:
+        arr = rdf["Direction"].to_numpy()
+        out["Direction"] = np.select(
+            [arr == "Improving", arr == "Declining"],
+            ["background-color: rgba(34,197,94,0.25); font-weight: 600",
+             "background-color: rgba(239,68,68,0.25); font-weight: 600"],
+            "")
+    # Vol(x) and Dlv(x) highlighted above 1.5
+    for c in ["Vol(x)", "Dlv(x)"]:
+        if c in rdf.columns:
+            arr = pd.to_numeric(rdf[c], errors="coerce").to_numpy()
+            out[c] = np.where(
+                arr >= 1.5,
+                "background-color: rgba(34,197,94,0.3); font-weight: 600", "")
+    return out
+
+
+# Per-sector display frame, built once per (dates, window, mcap, sector)
+# — clicking between sectors becomes a cache lookup, not a rebuild
+@st.cache_data(ttl=300)
+def _sector_df_cached(dates_key: tuple, window: int, mcap: str, sector: str) -> pd.DataFrame:
+    rot = _rot_cached(dates_key, window, mcap)
+    stocks = next((r.get("stocks_list", []) for r in rot if r["Sector"] == sector), [])
+    if not stocks:
+        return pd.DataFrame()
+    # Score the frame in batch — no per-stock outrunner_conviction calls
+    sdf = pd.DataFrame(stocks)
+    sdf["Conv"] = scorer.outrunner_conviction_vec(sdf)
+    sdf = sdf.sort_values(["score", "change_pct"],
+                          ascending=[False, False], kind="stable")
+    sdf["symbol"] = _symbol_links(sdf["symbol"])
+    return sdf.rename(columns={
+        "symbol": "Symbol", "score": "Score", "change_pct": "Chg%",
+        "volume_times": "Vol(x)", "delivery_times": "Dlv(x)",
+        "cumulative_future_oi": "Fut OI", "oi_change_pct": "Fut OI Chg%",
+        "cumulative_call_oi": "Call OI", "call_oi_change_pct": "Call OI Chg%",
+        "cumulative_put_oi": "Put OI", "put_oi_change_pct": "Put OI Chg%",
+        "pcr": "PCR", "pcr_change_1d": "PCR Chg",
+        "oi_trend": "OI Trend", "mcap_category": "MCap",
+    })[["Symbol", "Conv", "Score", "Chg%", "Vol(x)", "Dlv(x)",
+        "Fut OI", "Fut OI Chg%", "Call OI", "Call OI Chg%",
+        "Put OI", "Put OI Chg%", "PCR", "PCR Chg", "OI Trend", "MCap"]]
+
+
+# Fragment: the whole rotation subgraph — clicking a sector row or the back
+# button reruns only this block, never the data load / metrics / picks above
+@st.fragment
+def _render_sector_rotation(dates_key, window, mcap_filter):
+    st.subheader(f"Sector Rotation — {mcap_filter}")
+    st.caption("Click a sector row to see its stocks (same page)")
+    rot = _rot_cached(dates_key, window, mcap_filter)
+    if not rot:
+        st.caption("No sector data for this filter.")
+        return
 
-if rot:
-    sector_to_stocks = {r["Sector"]: r.get("stocks_list", []) for r in rot}
     rot_display = [{k: v for k, v in r.items() if k != "stocks_list"} for r in rot]
     rdf = pd.DataFrame(rot_display)
 
@@ -158,26 +267,10 @@ if rot:
                "Vol(x)": "{:.2f}", "Dlv(x)": "{:.2f}", "PCR": "{:.2f}", "PCR Δ": "{:+.2f}",
                "Agg Call OI": "{:,.0f}", "Agg Put OI": "{:,.0f}",
                "Agg Call OI Chg%": "{:+.2f}", "Agg Put OI Chg%": "{:+.2f}"}
-    chg_cols = [c for c in rdf.columns if "Chg" in c or "Δ" in c]
+    rot_css = _rot_css(rdf)
     styled = (rdf.style
               .format({k: v for k, v in fmt_map.items() if k in rdf.columns}, na_rep="—")
-              .map(
-                  lambda v: "color: #22c55e" if v is not None and isinstance(v, (int, float)) and v > 0
-                  else "color: #ef4444" if v is not None and isinstance(v, (int, float)) and v < 0 else "",
-                  subset=chg_cols))
-    # Highlight OI trend (Direction) — Improving=green, Declining=red
-    if "Direction" in rdf.columns:
-        def _dir_color(v):
-            if v == "Improving": return "background-color: rgba(34,197,94,0.25); font-weight: 600"
-            if v == "Declining": return "background-color: rgba(239,68,68,0.25); font-weight: 600"
-            return ""
-        styled = styled.map(lambda v: _dir_color(v) if isinstance(v, str) else "", subset=["Direction"])
-    # Highlight Vol(x) and Dlv(x) when above 1.5
-    for col in ["Vol(x)", "Dlv(x)"]:
-        if col in rdf.columns:
-            styled = styled.map(
-                lambda v: "background-color: rgba(34,197,94,0.3); font-weight: 600" if v is not None and isinstance(v, (int, float)) and v >= 1.5 else "",
-                subset=[col])
+              .apply(lambda _: rot_css, axis=None))
     event = st.dataframe(styled, width="stretch", hide_index=True, height=400,
                          on_select="rerun", selection_mode="single-row",
                          key=f"sector_rotation_df_{st.session_state.sector_df_key}")
@@ -185,70 +278,59 @@ if rot:
         idx = event.selection.rows[0]
         st.session_state.selected_sector = rdf.iloc[idx]["Sector"]
 
-    # Back button when sector selected
-    if st.session_state.selected_sector:
-        if st.button("← Back to Sector Rotation", key="sector_back"):
-            st.session_state.selected_sector = None
-            st.session_state.sector_df_key += 1
-            st.rerun()
-        st.subheader(f"Stocks in **{st.session_state.selected_sector}** — click symbol for analysis")
-        stocks_in_sector = sector_to_stocks.get(st.session_state.selected_sector, [])
-        if stocks_in_sector:
-            stocks_in_sector.sort(key=lambda x: (x.get("score", 0), x.get("change_pct", 0)), reverse=True)
-            rows = []
-            for s in stocks_in_sector:
-                sym = s.get("symbol", "")
-                s_full = dict(s, symbol=sym)
-                conv = scorer.outrunner_conviction(s_full)["conviction"] if sym else 0
-                rows.append({
-                    "Symbol": f"/Stock_Analysis?symbol={sym}",
-                    "Conv": conv,
-                    "Score": s.get("score", 0),
-                    "Chg%": s.get("change_pct"),
-                    "Vol(x)": s.get("volume_times", 0),
-                    "Dlv(x)": s.get("delivery_times", 0),
-                    "Fut OI": s.get("cumulative_future_oi"),
-                    "Fut OI Chg%": s.get("oi_change_pct"),
-                    "Call OI": s.get("cumulative_call_oi"),
-                    "Call OI Chg%": s.get("call_oi_change_pct"),
-                    "Put OI": s.get("cumulative_put_oi"),
-                    "Put OI Chg%": s.get("put_oi_change_pct"),
-                    "PCR": s.get("pcr", 0),
-                    "PCR Chg": s.get("pcr_change_1d"),
-                    "OI Trend": s.get("oi_trend", ""),
-                    "MCap": s.get("mcap_category", ""),
-                })
-            sdf = pd.DataFrame(rows)
-            schg_cols = [c for c in sdf.columns if "Chg" in c]
-            sfmt = {c: "{:+.1f}" for c in ["Chg%", "Fut OI Chg%", "Call OI Chg%", "Put OI Chg%"] if c in sdf.columns}
-            sfmt.update({c: "{:+.2f}" for c in ["PCR Chg"] if c in sdf.columns})
-            sfmt.update({c: "{:.2f}" for c in ["Vol(x)", "Dlv(x)", "PCR"] if c in sdf.columns})
-            sfmt.update({c: "{:,.0f}" for c in ["Fut OI", "Call OI", "Put OI"] if c in sdf.columns})
-            _scolor = lambda s: ["color: #22c55e" if v is not None and isinstance(v, (int, float)) and v > 0
-                                 else "color: #ef4444" if v is not None and isinstance(v, (int, float)) and v < 0 else "" for v in s]
-            styled_s = sdf.style.format(sfmt, na_rep="—")
-            if schg_cols:
-                styled_s = styled_s.apply(_scolor, subset=schg_cols)
-            # Highlight OI Trend, Vol(x), Dlv(x) when above 1.5
-            if "OI Trend" in sdf.columns:
-                _oi_color = lambda v: "background-color: rgba(34,197,94,0.2)" if v in ("NewLong", "ShortCover") else "background-color: rgba(239,68,68,0.2)" if v in ("NewShort", "LongCover") else ""
-                styled_s = styled_s.map(lambda v: _oi_color(v) if isinstance(v, str) else "", subset=["OI Trend"])
-            for col in ["Vol(x)", "Dlv(x)"]:
-                if col in sdf.columns:
-                    styled_s = styled_s.map(lambda v: "background-color: rgba(34,197,94,0.3); font-weight: 600" if v is not None and isinstance(v, (int, float)) and v >= 1.5 else "", subset=[col])
-            st.dataframe(styled_s, width="stretch", hide_index=True,
-                         column_config={"Symbol": st.column_config.LinkColumn(
-                             "Symbol", display_text=r".*symbol=([^&]+)")})
-        else:
-            st.caption("No stocks in this sector.")
-else:
-    st.caption("No sector data for this filter.")
+    if not st.session_state.selected_sector:
+        return
+
+    # Back button: both the selection state and the table's widget key live
+    # in this fragment, so a fragment-scoped rerun resets the table
+    if st.button("← Back to Sector Rotation", key="sector_back"):
+        st.session_state.selected_sector = None
+        st.session_state.sector_df_key += 1
+        st.rerun(scope="fragment")
+    st.subheader(f"Stocks in **{st.session_state.selected_sector}** — click symbol for analysis")
+    sdf = _sector_df_cached(dates_key, window, mcap_filter, st.session_state.selected_sector)
+    if not sdf.empty:
+        schg_cols = [c for c in sdf.columns if "Chg" in c]
+        sfmt = {c: "{:+.1f}" for c in ["Chg%", "Fut OI Chg%", "Call OI Chg%", "Put OI Chg%"] if c in sdf.columns}
+        sfmt.update({c: "{:+.2f}" for c in ["PCR Chg"] if c in sdf.columns})
+        sfmt.update({c: "{:.2f}" for c in ["Vol(x)", "Dlv(x)", "PCR"] if c in sdf.columns})
+        sfmt.update({c: "{:,.0f}" for c in ["Fut OI", "Call OI", "Put OI"] if c in sdf.columns})
+        # One CSS matrix for the whole table — NumPy compares per column
+        # instead of a Python lambda per cell
+        def _stock_css(df):
+            out = pd.DataFrame("", index=df.index, columns=df.columns)
+            for c in schg_cols:
+                a = pd.to_numeric(df[c], errors="coerce").to_numpy()
+                out[c] = np.where(a > 0, "color: #22c55e",
+                                  np.where(a < 0, "color: #ef4444", ""))
+            if "OI Trend" in df.columns:
+                trend = df["OI Trend"].to_numpy()
+                out["OI Trend"] = np.where(
+                    np.isin(trend, ["NewLong", "ShortCover"]),
+                    "background-color: rgba(34,197,94,0.2)",
+                    np.where(np.isin(trend, ["NewShort", "LongCover"]),
+                             "background-color: rgba(239,68,68,0.2)", ""))
+            for c in ["Vol(x)", "Dlv(x)"]:
+                if c in df.columns:
+                    a = pd.to_numeric(df[c], errors="coerce").to_numpy()
+                    out[c] = np.where(a >= 1.5,
+                                      "background-color: rgba(34,197,94,0.3); font-weight: 600", "")
+            return out
+
+        styled_s = sdf.style.format(sfmt, na_rep="—").apply(_stock_css, axis=None)
+        st.dataframe(styled_s, width="stretch", hide_index=True,
+                     column_config={"Symbol": _SYMBOL_LINK_COL})
+    else:
+        st.caption("No stocks in this sector.")
+
+
+_render_sector_rotation(dates_key, window, mcap_filter)
 
 st.divider()
 
 # ── Top 7 Picks (Outrunner) ───────────────────────────────────
 st.subheader(f"Top 7 Picks — {view_date} (Outrunner Strategy)")
-top7 = recommender.get_top_picks(sig_data, dates_up_to_view, view_date, mcap_filter, top_n=7)
+top7 = _top_picks_cached(dates_key, view_date, mcap_filter, top_n=7)
 if top7:
     for i, p in enumerate(top7, 1):
         sym = p["symbol"]
@@ -263,85 +345,110 @@ else:
     st.caption("No picks in sweet spot (score 20–34) for this filter.")
 
 # ── Historical Top 7 Performance ──────────────────────────────
-hist_perf = recommender.get_historical_top7_performance(sig_data, dates_up_to_view, lookback_days=5)
+hist_perf = _hist_perf_cached(dates_key, lookback_days=5)
 if hist_perf:
     with st.expander(f"Last 5 days: {hist_perf['green_count']}/{hist_perf['total_picks']} green, avg {hist_perf['avg_chg_pct']:+.1f}%"):
-        for d in hist_perf.get("details", [])[:10]:
-            st.caption(f"{d['date']} {d['symbol']}: {d['pnl_pct']:+.1f}%")
+        # one caption element instead of one per pick
+        detail_lines = "  \n".join(
+            f"{d['date']} {d['symbol']}: {d['pnl_pct']:+.1f}%"
+            for d in hist_perf.get("details", [])
+        )
+        if detail_lines:
+            st.caption(detail_lines)
 
 st.divider()
 
 # ── Alerts (below all) ─────────────────────────────────────────
-st.subheader("🔔 Alerts & Signals")
-alert_type = st.selectbox(
-    "Alert Type",
-    ["All", "OI Trend Flips", "PCR Extremes", "Delivery Spikes", "3+ Day Streaks"],
-    key="home_alert_type",
-)
+# Detector results keyed on (dates, view_date, mcap) — the alert-type
+# selectbox inside the fragment reruns it, but the detectors themselves only
+# recompute when their actual inputs change
+@st.cache_data(ttl=300)
+def _alerts_cached(dates_key: tuple, view_date: str, mcap: str):
+    d = list(dates_key)
+    adf = signals.flatten(loader.signal_data(d), d)
+    # One boolean mask over the flattened frame replaces the five per-list
+    # _filter_mcap passes — the detectors then only see the filtered rows
+    if mcap != "All":
+        adf = adf[adf["mcap_category"] == mcap]
+    return (
+        signals.detect_trend_flips(adf, d),
+        signals.pcr_extremes(adf, view_date),
+        signals.delivery_spikes(adf, view_date, 2.0),
+        signals.score_streaks(adf, d, 3),
+    )
 
-def _filter_mcap(items, mcap):
-    if mcap == "All":
-        return items
-    return [x for x in items if x.get("mcap_category") == mcap]
-
-flips = _filter_mcap(signals.detect_trend_flips(sig_data, dates_up_to_view), mcap_filter)
-ext = signals.pcr_extremes(sig_data, view_date)
-low_pcr = _filter_mcap(ext["low_pcr"], mcap_filter)
-high_pcr = _filter_mcap(ext["high_pcr"], mcap_filter)
-spikes = _filter_mcap(signals.delivery_spikes(sig_data, view_date, 2.0), mcap_filter)
-streaks = _filter_mcap(signals.score_streaks(sig_data, dates_up_to_view, 3), mcap_filter)
-
-n_flips, n_pcr = len(flips), len(low_pcr) + len(high_pcr)
-n_spikes, n_streaks = len(spikes), len(streaks)
-st.caption(f"**{view_date}** | {mcap_filter} | {n_flips} flips · {n_pcr} PCR extremes · {n_spikes} delivery spikes · {n_streaks} streaks")
-
-if alert_type in ("All", "OI Trend Flips"):
-    st.markdown("**OI Trend Flips (Bearish → Bullish)**")
-    if flips:
-        flips_df = pd.DataFrame(flips)
-        flips_df["symbol"] = flips_df["symbol"].apply(lambda s: f"/Stock_Analysis?symbol={s}")
-        display_cols = ["symbol", "prev_trend", "new_trend", "conviction", "change_pct", "pcr", "sector"]
-        st.dataframe(flips_df[[c for c in display_cols if c in flips_df.columns]], hide_index=True,
-                    column_config={"symbol": st.column_config.LinkColumn("Symbol", display_text=r".*symbol=([^&]+)")})
-    else:
-        st.caption("No bullish flips for this filter.")
-
-if alert_type in ("All", "PCR Extremes"):
-    st.markdown("**PCR Extremes**")
-    c1, c2 = st.columns(2)
-    with c1:
-        st.caption("Low PCR ≤ 0.5")
-        if low_pcr:
-            ldf = pd.DataFrame(low_pcr)[["symbol", "pcr", "change_pct", "oi_trend", "sector"]]
-            ldf["symbol"] = ldf["symbol"].apply(lambda s: f"/Stock_Analysis?symbol={s}")
-            st.dataframe(ldf, hide_index=True, column_config={"symbol": st.column_config.LinkColumn("Symbol", display_text=r".*symbol=([^&]+)")})
+
+# Fragment: switching Alert Type only reruns this subgraph — the data load,
+# key metrics, sector rotation and Top 7 above never re-execute
+@st.fragment
+def _render_alerts(dates_key, view_date, mcap_filter):
+    st.subheader("🔔 Alerts & Signals")
+    alert_type = st.selectbox(
+        "Alert Type",
+        ["All", "OI Trend Flips", "PCR Extremes", "Delivery Spikes", "3+ Day Streaks"],
+        key="home_alert_type",
+    )
+
+    flips, ext, spikes, streaks = _alerts_cached(
+        dates_key, view_date, mcap_filter
+    )
+    low_pcr = ext["low_pcr"]
+    high_pcr = ext["high_pcr"]
+
+    n_flips, n_pcr = len(flips), len(low_pcr) + len(high_pcr)
+    n_spikes, n_streaks = len(spikes), len(streaks)
+    st.caption(f"**{view_date}** | {mcap_filter} | {n_flips} flips · {n_pcr} PCR extremes · {n_spikes} delivery spikes · {n_streaks} streaks")
+
+    if alert_type in ("All", "OI Trend Flips"):
+        st.markdown("**OI Trend Flips (Bearish → Bullish)**")
+        if not flips.empty:
+            display_cols = ["symbol", "prev_trend", "new_trend", "conviction", "change_pct", "pcr", "sector"]
+            flips_df = flips[[c for c in display_cols if c in flips.columns]].copy()
+            flips_df["symbol"] = _symbol_links(flips_df["symbol"])
+            st.dataframe(flips_df, hide_index=True,
+                        column_config={"symbol": _SYMBOL_LINK_COL})
         else:
-            st.caption("None")
-    with c2:
-        st.caption("High PCR ≥ 1.5")
-        if high_pcr:
-            hdf = pd.DataFrame(high_pcr)[["symbol", "pcr", "change_pct", "oi_trend", "sector"]]
-            hdf["symbol"] = hdf["symbol"].apply(lambda s: f"/Stock_Analysis?symbol={s}")
-            st.dataframe(hdf, hide_index=True, column_config={"symbol": st.column_config.LinkColumn("Symbol", display_text=r".*symbol=([^&]+)")})
+            st.caption("No bullish flips for this filter.")
+
+    if alert_type in ("All", "PCR Extremes"):
+        st.markdown("**PCR Extremes**")
+        c1, c2 = st.columns(2)
+        with c1:
+            st.caption("Low PCR ≤ 0.5")
+            if not low_pcr.empty:
+                ldf = low_pcr[["symbol", "pcr", "change_pct", "oi_trend", "sector"]].copy()
+                ldf["symbol"] = _symbol_links(ldf["symbol"])
+                st.dataframe(ldf, hide_index=True, column_config={"symbol": _SYMBOL_LINK_COL})
+            else:
+                st.caption("None")
+        with c2:
+            st.caption("High PCR ≥ 1.5")
+            if not high_pcr.empty:
+                hdf = high_pcr[["symbol", "pcr", "change_pct", "oi_trend", "sector"]].copy()
+                hdf["symbol"] = _symbol_links(hdf["symbol"])
+                st.dataframe(hdf, hide_index=True, column_config={"symbol": _SYMBOL_LINK_COL})
+            else:
+                st.caption("None")
+
+    if alert_type in ("All", "Delivery Spikes"):
+        st.markdown("**Delivery Spikes (≥ 2x)**")
+        if not spikes.empty:
+            spdf = spikes[["symbol", "delivery_times", "volume_times", "score", "change_pct", "oi_trend", "sector"]].copy()
+            spdf["symbol"] = _symbol_links(spdf["symbol"])
+            st.dataframe(spdf, hide_index=True, column_config={"symbol": _SYMBOL_LINK_COL})
         else:
-            st.caption("None")
-
-if alert_type in ("All", "Delivery Spikes"):
-    st.markdown("**Delivery Spikes (≥ 2x)**")
-    if spikes:
-        spdf = pd.DataFrame(spikes)[["symbol", "delivery_times", "volume_times", "score", "change_pct", "oi_trend", "sector"]]
-        spdf["symbol"] = spdf["symbol"].apply(lambda s: f"/Stock_Analysis?symbol={s}")
-        st.dataframe(spdf, hide_index=True, column_config={"symbol": st.column_config.LinkColumn("Symbol", display_text=r".*symbol=([^&]+)")})
-    else:
-        st.caption("No delivery spikes.")
-
-if alert_type in ("All", "3+ Day Streaks"):
-    st.markdown("**3+ Day Streaks (Score 20–34)**")
-    if streaks:
-        stdf = pd.DataFrame(streaks)[["symbol", "streak_days", "conviction", "score", "change_pct", "oi_trend", "sector"]]
-        stdf["symbol"] = stdf["symbol"].apply(lambda s: f"/Stock_Analysis?symbol={s}")
-        st.dataframe(stdf, hide_index=True, column_config={"symbol": st.column_config.LinkColumn("Symbol", display_text=r".*symbol=([^&]+)")})
-    else:
-        st.caption("No multi-day streaks.")
+            st.caption("No delivery spikes.")
+
+    if alert_type in ("All", "3+ Day Streaks"):
+        st.markdown("**3+ Day Streaks (Score 20–34)**")
+        if not streaks.empty:
+            stdf = streaks[["symbol", "streak_days", "conviction", "score", "change_pct", "oi_trend", "sector"]].copy()
+            stdf["symbol"] = _symbol_links(stdf["symbol"])
+            st.dataframe(stdf, hide_index=True, column_config={"symbol": _SYMBOL_LINK_COL})
+        else:
+            st.caption("No multi-day streaks.")
+
+
+_render_alerts(dates_key, view_date, mcap_filter)
 
 
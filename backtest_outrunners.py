@@ -15,7 +15,6 @@ is tradeable for options, but ideally in the predicted bullish direction).
 
 import sys
 from pathlib import Path
-from collections import defaultdict
 
 # So we can import core.* without streamlit
 import types
@@ -28,8 +27,11 @@ _fake_st.cache_resource = _passthrough
 _fake_st.cache_data = _passthrough
 sys.modules["streamlit"] = _fake_st
 
+import numpy as np
+import pandas as pd
+
 from core.loader import DataCache
-from core.scorer import base_score, score_breakdown, BULLISH
+from core.scorer import base_score_vec, score_breakdown, BULLISH
 
 # ── Config ──────────────────────────────────────────────────
 TOP_N        = 3          # how many stocks we pick per day
@@ -37,6 +39,154 @@ OUTRUNNER    = 1.5        # % move from open to qualify as outrunner
 MODERATE     = 0.8        # % move from open to qualify as moderate
 DAYS         = 60         # how many days of data
 
+# ── Panel construction (vectorized pick engine) ─────────────
+
+# Derivative fields the backtest reads per (date, symbol)
+_PANEL_COLS = [
+    "close", "pcr", "pcr_change_1d", "oi_change_pct", "volume_times",
+    "delivery_times", "change_pct", "oi_trend", "mcap_category", "sector",
+]
+
+
+def build_panel(cache: DataCache) -> pd.DataFrame:
+    """Flatten cache.data + next-day OHLC into one long frame with a row
+    per (pick_date, symbol), then score it and compute every next-day move
+    as whole-array passes — no per-pair Python arithmetic."""
+    next_of = dict(zip(cache.dates[:-1], cache.dates[1:]))
+    frames = []
+    for dt in cache.dates[:-1]:
+        day = cache.data.get(dt, {})
+        if not day:
+            continue
+        f = pd.DataFrame.from_records(list(day.values()))
+        for c in _PANEL_COLS:
+            if c not in f.columns:
+                f[c] = None
+        f = f[["symbol"] + _PANEL_COLS].copy()
+        f["pick_date"] = dt
+        f["next_date"] = next_of[dt]
+        frames.append(f)
+    if not frames:
+        return pd.DataFrame()
+    panel = pd.concat(frames, ignore_index=True)
+    panel["score"] = base_score_vec(panel)
+
+    # Next-day OHLC, merged in one pass
+    ohlc_rows = [
+        (sym, d, o["open"], o["high"], o["low"], o["close"])
+        for sym, days in cache.ohlc.items() for d, o in days.items()
+    ]
+    ohlc_df = pd.DataFrame.from_records(
+        ohlc_rows,
+        columns=["symbol", "next_date", "nxt_open", "nxt_high", "nxt_low", "nxt_close_raw"],
+    )
+    panel = panel.merge(ohlc_df, on=["symbol", "next_date"], how="left")
+
+    # Next-day derivative close (fallback when OHLC close is missing/zero)
+    close_rows = [
+        (sym, d, s.get("close", 0))
+        for d, day in cache.data.items() for sym, s in day.items()
+    ]
+    dclose = pd.DataFrame.from_records(
+        close_rows, columns=["symbol", "next_date", "nxt_deriv_close"]
+    )
+    panel = panel.merge(dclose, on=["symbol", "next_date"], how="left")
+
+    close = pd.to_numeric(panel["close"], errors="coerce").fillna(0)
+    o = pd.to_numeric(panel["nxt_open"], errors="coerce")
+    h = pd.to_numeric(panel["nxt_high"], errors="coerce")
+    l = pd.to_numeric(panel["nxt_low"], errors="coerce")
+    raw_c = pd.to_numeric(panel["nxt_close_raw"], errors="coerce").fillna(0)
+    fallback = pd.to_numeric(panel["nxt_deriv_close"], errors="coerce").fillna(0)
+
+    nxt_close = raw_c.where(raw_c > 0, fallback.where(fallback > 0, 0))
+    gap = (o - close).abs() / close.where(close > 0) * 100
+    # sanity: prior close known, next open traded, no split-sized gap
+    panel["valid"] = ((close > 0) & (o > 0) & (gap <= 20)).fillna(False)
+    panel["nxt_close"] = nxt_close
+    panel["up_move"] = (h - o) / o * 100     # max upside %
+    panel["down_move"] = (o - l) / o * 100   # max downside %
+    panel["close_chg"] = (nxt_close - o) / o * 100
+    panel["range_pct"] = (h - l) / o * 100
+    panel["max_move"] = np.maximum(panel["up_move"], panel["down_move"])
+    panel["label"] = np.select(
+        [panel["max_move"] >= OUTRUNNER, panel["max_move"] >= MODERATE],
+        ["OUTRUNNER", "MODERATE"], "DUD",
+    )
+    return panel
+
+
+# Score-breakdown buckets → pick-frame column names
+_BD_COLS = {
+    "OI Trend": "bd_oi_trend", "PCR": "bd_pcr", "OI Change": "bd_oi_chg",
+    "Volume": "bd_volume", "Delivery": "bd_delivery",
+    "Momentum": "bd_momentum", "Bonus": "bd_bonus",
+}
+
+
+def collect_picks(cache: DataCache, panel: pd.DataFrame) -> pd.DataFrame:
+    """Top-N sweet-spot picks per day with next-day outcome, as one
+    columnar frame — every report section reduces typed columns instead of
+    re-reading 30-key dicts. Candidate filtering and ranking happen on the
+    panel; only the ~TOP_N×days score breakdowns fall back to Python."""
+    if panel.empty:
+        return pd.DataFrame()
+    vol = pd.to_numeric(panel["volume_times"], errors="coerce").fillna(0)
+    pcr = pd.to_numeric(panel["pcr"], errors="coerce").fillna(1)
+    cand = ~((vol < 0.7) & (pcr >= 1)) & panel["score"].between(20, 34)
+    # stable sorts keep same-score ties in data order, like the old
+    # per-day list.sort; top-N is taken before OHLC validity so bad-data
+    # picks consume a slot exactly as before
+    top = (
+        panel[cand]
+        .sort_values("score", ascending=False, kind="stable")
+        .groupby("pick_date", sort=False).head(TOP_N)
+        .sort_values("pick_date", kind="stable")
+    )
+    top = top[top["valid"]].reset_index(drop=True)
+
+    picks = pd.DataFrame({
+        "pick_date":  top["pick_date"],
+        "next_date":  top["next_date"],
+        "symbol":     top["symbol"],
+        "score":      top["score"].astype(int),
+        "close":      pd.to_numeric(top["close"], errors="coerce").fillna(0),
+        "oi_trend":   top["oi_trend"].fillna(""),
+        "pcr":        pd.to_numeric(top["pcr"], errors="coerce").fillna(0),
+        "pcr_chg":    pd.to_numeric(top["pcr_change_1d"], errors="coerce").fillna(0),
+        "oi_chg_pct": pd.to_numeric(top["oi_change_pct"], errors="coerce").fillna(0),
+        "vol_times":  pd.to_numeric(top["volume_times"], errors="coerce").fillna(0),
+        "dlv_times":  pd.to_numeric(top["delivery_times"], errors="coerce").fillna(0),
+        "change_pct": pd.to_numeric(top["change_pct"], errors="coerce").fillna(0),
+        "mcap":       top["mcap_category"].fillna(""),
+        "sector":     top["sector"].fillna(""),
+        # next day
+        "nxt_open":   top["nxt_open"].round(2),
+        "nxt_high":   top["nxt_high"].round(2),
+        "nxt_low":    top["nxt_low"].round(2),
+        "nxt_close":  top["nxt_close"].round(2),
+        "up_move":    top["up_move"].round(2),
+        "down_move":  top["down_move"].round(2),
+        "close_chg":  top["close_chg"].round(2),
+        "range_pct":  top["range_pct"].round(2),
+        "max_move":   top["max_move"].round(2),
+        "label":      top["label"],
+        # Was the move in our predicted direction (bullish)?
+        "direction_ok": top["close_chg"] > 0,
+        "is_out":     top["label"] == "OUTRUNNER",
+        "is_mod":     top["label"] == "MODERATE",
+    })
+
+    # per-pick score breakdown (small: TOP_N × days rows)
+    bds = [
+        score_breakdown(cache.data[d][s])
+        for d, s in zip(picks["pick_date"], picks["symbol"])
+    ]
+    for bucket, col in _BD_COLS.items():
+        picks[col] = [bd.get(bucket, 0) for bd in bds]
+    return picks
+
+
 # ── Load data ───────────────────────────────────────────────
 print("Loading 60 days of data...")
 cache = DataCache()
@@ -47,124 +197,15 @@ print()
 
 # ── Run picks and track next-day outcome ────────────────────
 
-all_picks = []       # every pick with full context
-outrunners = []
-moderates = []
-duds = []
-
-for i, dt in enumerate(cache.dates):
-    if i + 1 >= len(cache.dates):
-        break  # need next day
-
-    next_dt = cache.dates[i + 1]
-
-    # Pick stocks using Sweet Spot (score 20-34)
-    candidates = []
-    for sym, s in cache.data.get(dt, {}).items():
-        vol = s.get("volume_times", 0)
-        pcr = s.get("pcr", 1)
-        if vol < 0.7 and pcr >= 1:
-            continue
-        sc = base_score(s)
-        if 20 <= sc <= 34:
-            candidates.append((sym, sc, s))
-    candidates.sort(key=lambda x: x[1], reverse=True)
-
-    for sym, sc, s in candidates[:TOP_N]:
-        close = s.get("close", 0)
-        if close <= 0:
-            continue
-
-        # Next day OHLC
-        ohlc = cache.ohlc.get(sym, {}).get(next_dt)
-        nxt_deriv = cache.data.get(next_dt, {}).get(sym)
-
-        if not ohlc or ohlc["open"] <= 0:
-            continue
-
-        nxt_open  = ohlc["open"]
-        nxt_high  = ohlc["high"]
-        nxt_low   = ohlc["low"]
-        nxt_close = ohlc["close"] if ohlc["close"] > 0 else (
-            nxt_deriv["close"] if nxt_deriv and nxt_deriv.get("close", 0) > 0 else 0
-        )
-
-        # Sanity check (skip splits / bad data)
-        gap = abs((nxt_open - close) / close * 100)
-        if gap > 20:
-            continue
-
-        # Calculate intraday moves from open
-        up_move   = (nxt_high - nxt_open) / nxt_open * 100   # max upside %
-        down_move = (nxt_open - nxt_low) / nxt_open * 100    # max downside %
-        close_chg = (nxt_close - nxt_open) / nxt_open * 100  # open→close %
-        range_pct = (nxt_high - nxt_low) / nxt_open * 100    # total range %
-
-        # For bullish picks: up_move is what matters most
-        # But for options, even down_move is tradeable (buy puts)
-        max_move = max(up_move, down_move)
-
-        # Classify
-        if max_move >= OUTRUNNER:
-            label = "OUTRUNNER"
-        elif max_move >= MODERATE:
-            label = "MODERATE"
-        else:
-            label = "DUD"
-
-        # Was the move in our predicted direction (bullish)?
-        direction_correct = close_chg > 0
-
-        bd = score_breakdown(s)
-
-        pick = {
-            "pick_date":   dt,
-            "next_date":   next_dt,
-            "symbol":      sym,
-            "score":       sc,
-            "close":       close,
-            "oi_trend":    s.get("oi_trend", ""),
-            "pcr":         s.get("pcr", 0),
-            "pcr_chg":     s.get("pcr_change_1d", 0),
-            "oi_chg_pct":  s.get("oi_change_pct", 0),
-            "vol_times":   s.get("volume_times", 0),
-            "dlv_times":   s.get("delivery_times", 0),
-            "change_pct":  s.get("change_pct", 0),
-            "mcap":        s.get("mcap_category", ""),
-            "sector":      s.get("sector", ""),
-            # next day
-            "nxt_open":    round(nxt_open, 2),
-            "nxt_high":    round(nxt_high, 2),
-            "nxt_low":     round(nxt_low, 2),
-            "nxt_close":   round(nxt_close, 2),
-            "up_move":     round(up_move, 2),
-            "down_move":   round(down_move, 2),
-            "close_chg":   round(close_chg, 2),
-            "range_pct":   round(range_pct, 2),
-            "max_move":    round(max_move, 2),
-            "label":       label,
-            "direction_ok": direction_correct,
-            # score breakdown
-            "bd_oi_trend":  bd.get("OI Trend", 0),
-            "bd_pcr":       bd.get("PCR", 0),
-            "bd_oi_chg":    bd.get("OI Change", 0),
-            "bd_volume":    bd.get("Volume", 0),
-            "bd_delivery":  bd.get("Delivery", 0),
-            "bd_momentum":  bd.get("Momentum", 0),
-            "bd_bonus":     bd.get("Bonus", 0),
-        }
-
-        all_picks.append(pick)
-        if label == "OUTRUNNER":
-            outrunners.append(pick)
-        elif label == "MODERATE":
-            moderates.append(pick)
-        else:
-            duds.append(pick)
+panel = build_panel(cache)
+picks_df = collect_picks(cache, panel)
+outrunners = picks_df[picks_df["is_out"]] if not picks_df.empty else picks_df
+moderates = picks_df[picks_df["is_mod"]] if not picks_df.empty else picks_df
+duds = picks_df[picks_df["label"] == "DUD"] if not picks_df.empty else picks_df
 
 
 # ── RESULTS ─────────────────────────────────────────────────
-total = len(all_picks)
+total = len(picks_df)
 if total == 0:
     print("No picks generated. Check data.")
     sys.exit(1)
@@ -192,10 +233,10 @@ print(f"  Actionable (OUT+MOD):    {n_out+n_mod:>3} picks  ({(n_out+n_mod)/total
 print()
 
 # Direction accuracy
-dir_ok = sum(1 for p in all_picks if p["direction_ok"])
-out_dir = sum(1 for p in outrunners if p["direction_ok"])
+dir_ok = int(picks_df["direction_ok"].sum())
+out_dir = int(outrunners["direction_ok"].sum())
 print(f"  Direction correct (closed green):  {dir_ok}/{total}  ({dir_ok/total*100:.1f}%)")
-if outrunners:
+if n_out:
     print(f"  Outrunners that closed green:      {out_dir}/{n_out}  ({out_dir/n_out*100:.1f}%)")
 print()
 
@@ -204,52 +245,36 @@ print("─" * 70)
 print("  2. AVERAGE NEXT-DAY MOVES")
 print("─" * 70)
 
-def avg(lst, key):
-    vals = [p[key] for p in lst]
-    return sum(vals) / len(vals) if vals else 0
+def avg(df, col):
+    return df[col].mean() if len(df) else 0
 
 print(f"  {'Category':<15} {'Avg Up%':>8} {'Avg Down%':>10} {'Avg Range%':>11} {'Avg Close%':>11}")
 print(f"  {'─'*15} {'─'*8} {'─'*10} {'─'*11} {'─'*11}")
-print(f"  {'ALL PICKS':<15} {avg(all_picks,'up_move'):>+8.2f} {avg(all_picks,'down_move'):>10.2f} {avg(all_picks,'range_pct'):>11.2f} {avg(all_picks,'close_chg'):>+11.2f}")
-if outrunners:
+print(f"  {'ALL PICKS':<15} {avg(picks_df,'up_move'):>+8.2f} {avg(picks_df,'down_move'):>10.2f} {avg(picks_df,'range_pct'):>11.2f} {avg(picks_df,'close_chg'):>+11.2f}")
+if n_out:
     print(f"  {'OUTRUNNERS':<15} {avg(outrunners,'up_move'):>+8.2f} {avg(outrunners,'down_move'):>10.2f} {avg(outrunners,'range_pct'):>11.2f} {avg(outrunners,'close_chg'):>+11.2f}")
-if moderates:
+if n_mod:
     print(f"  {'MODERATE':<15} {avg(moderates,'up_move'):>+8.2f} {avg(moderates,'down_move'):>10.2f} {avg(moderates,'range_pct'):>11.2f} {avg(moderates,'close_chg'):>+11.2f}")
-if duds:
+if n_dud:
     print(f"  {'DUDS':<15} {avg(duds,'up_move'):>+8.2f} {avg(duds,'down_move'):>10.2f} {avg(duds,'range_pct'):>11.2f} {avg(duds,'close_chg'):>+11.2f}")
 
-# Compare vs random stocks (all stocks on same dates)
-random_moves = []
-for i, dt in enumerate(cache.dates):
-    if i + 1 >= len(cache.dates):
-        break
-    next_dt = cache.dates[i + 1]
-    for sym, s in cache.data.get(dt, {}).items():
-        cl = s.get("close", 0)
-        if cl <= 0:
-            continue
-        ohlc = cache.ohlc.get(sym, {}).get(next_dt)
-        if not ohlc or ohlc["open"] <= 0 or ohlc["high"] <= 0:
-            continue
-        gap = abs((ohlc["open"] - cl) / cl * 100)
-        if gap > 20:
-            continue
-        up = (ohlc["high"] - ohlc["open"]) / ohlc["open"] * 100
-        dn = (ohlc["open"] - ohlc["low"]) / ohlc["open"] * 100
-        rng = (ohlc["high"] - ohlc["low"]) / ohlc["open"] * 100
-        nc = ohlc["close"] if ohlc["close"] > 0 else 0
-        cc = (nc - ohlc["open"]) / ohlc["open"] * 100 if nc > 0 else 0
-        random_moves.append({"up": up, "dn": dn, "rng": rng, "cc": cc})
-
-if random_moves:
-    ru = sum(r["up"] for r in random_moves) / len(random_moves)
-    rd = sum(r["dn"] for r in random_moves) / len(random_moves)
-    rr = sum(r["rng"] for r in random_moves) / len(random_moves)
-    rc = sum(r["cc"] for r in random_moves) / len(random_moves)
+# Compare vs random stocks (all stocks on same dates) — the panel already
+# holds every (date, symbol) pair with its moves, so the baseline is four
+# column means over the valid rows instead of a second full traversal
+rand = panel[panel["valid"] & (pd.to_numeric(panel["nxt_high"], errors="coerce") > 0)]
+
+if not rand.empty:
+    ru = rand["up_move"].mean()
+    rd = rand["down_move"].mean()
+    rr = rand["range_pct"].mean()
+    # baseline close% never uses the derivative-close fallback and counts
+    # missing closes as 0, matching the old loop
+    raw_c = rand["nxt_close_raw"]
+    rc = ((raw_c - rand["nxt_open"]) / rand["nxt_open"] * 100).where(raw_c > 0, 0.0).mean()
     print(f"  {'RANDOM(all)':<15} {ru:>+8.2f} {rd:>10.2f} {rr:>11.2f} {rc:>+11.2f}")
     print()
-    print(f"  Our picks avg range: {avg(all_picks,'range_pct'):.2f}%  vs  Random: {rr:.2f}%")
-    edge = avg(all_picks, "range_pct") - rr
+    print(f"  Our picks avg range: {avg(picks_df,'range_pct'):.2f}%  vs  Random: {rr:.2f}%")
+    edge = avg(picks_df, "range_pct") - rr
     print(f"  EDGE over random:    {edge:+.2f}% range")
 print()
 
@@ -272,12 +297,12 @@ print(f"  {'Factor':<15} {'Outrunner':>10} {'Moderate':>10} {'Dud':>10} {'Signal
 print(f"  {'─'*15} {'─'*10} {'─'*10} {'─'*10} {'─'*20}")
 
 for name, key in factors:
-    vo = avg(outrunners, key) if outrunners else 0
-    vm = avg(moderates, key) if moderates else 0
-    vd = avg(duds, key) if duds else 0
+    vo = avg(outrunners, key) if n_out else 0
+    vm = avg(moderates, key) if n_mod else 0
+    vd = avg(duds, key) if n_dud else 0
 
     # Determine signal direction
-    if outrunners and duds:
+    if n_out and n_dud:
         diff = vo - vd
         if abs(diff) > 0.1:
             if diff > 0:
@@ -299,8 +324,8 @@ bd_keys = [("OI Trend", "bd_oi_trend"), ("PCR", "bd_pcr"), ("OI Change", "bd_oi_
            ("Volume", "bd_volume"), ("Delivery", "bd_delivery"),
            ("Momentum", "bd_momentum"), ("Bonus", "bd_bonus")]
 for name, key in bd_keys:
-    vo = avg(outrunners, key) if outrunners else 0
-    vd = avg(duds, key) if duds else 0
+    vo = avg(outrunners, key) if n_out else 0
+    vd = avg(duds, key) if n_dud else 0
     delta = vo - vd
     marker = " <<<" if abs(delta) >= 1.0 else ""
     print(f"  {name:<15} {vo:>10.2f} {vd:>10.2f} {delta:>+10.2f}{marker}")
@@ -312,24 +337,25 @@ print("─" * 70)
 print("  4. OI TREND → OUTRUNNER RATE")
 print("─" * 70)
 
-trend_stats = defaultdict(lambda: {"total": 0, "out": 0, "mod": 0, "dud": 0,
-                                    "avg_range": 0, "ranges": []})
-for p in all_picks:
-    t = p["oi_trend"]
-    trend_stats[t]["total"] += 1
-    trend_stats[t]["ranges"].append(p["range_pct"])
-    if p["label"] == "OUTRUNNER":
-        trend_stats[t]["out"] += 1
-    elif p["label"] == "MODERATE":
-        trend_stats[t]["mod"] += 1
-    else:
-        trend_stats[t]["dud"] += 1
+# One Cython groupby per breakdown; stable sorts keep the old tie order
+def _label_stats(by: str) -> pd.DataFrame:
+    st = picks_df.groupby(by, sort=False).agg(
+        total=("label", "size"),
+        out=("is_out", "sum"),
+        mod=("is_mod", "sum"),
+        avg_range=("range_pct", "mean"),
+    )
+    st["dud"] = st["total"] - st["out"] - st["mod"]
+    st["out_rate"] = st["out"] / st["total"]
+    return st.sort_values("out_rate", ascending=False, kind="stable")
+
+
+trend_stats = _label_stats("oi_trend")
 
 print(f"  {'OI Trend':<25} {'Picks':>6} {'Out%':>6} {'Mod%':>6} {'Dud%':>6} {'AvgRange%':>10}")
 print(f"  {'─'*25} {'─'*6} {'─'*6} {'─'*6} {'─'*6} {'─'*10}")
-for t, s in sorted(trend_stats.items(), key=lambda x: x[1]["out"]/max(x[1]["total"],1), reverse=True):
-    ar = sum(s["ranges"]) / len(s["ranges"]) if s["ranges"] else 0
-    print(f"  {t:<25} {s['total']:>6} {s['out']/s['total']*100:>5.0f}% {s['mod']/s['total']*100:>5.0f}% {s['dud']/s['total']*100:>5.0f}% {ar:>10.2f}")
+for s in trend_stats.itertuples():
+    print(f"  {s.Index:<25} {s.total:>6} {s.out/s.total*100:>5.0f}% {s.mod/s.total*100:>5.0f}% {s.dud/s.total*100:>5.0f}% {s.avg_range:>10.2f}")
 
 print()
 
@@ -338,19 +364,12 @@ print("─" * 70)
 print("  5. MARKET CAP → OUTRUNNER RATE")
 print("─" * 70)
 
-mcap_stats = defaultdict(lambda: {"total": 0, "out": 0, "ranges": []})
-for p in all_picks:
-    m = p["mcap"]
-    mcap_stats[m]["total"] += 1
-    mcap_stats[m]["ranges"].append(p["range_pct"])
-    if p["label"] == "OUTRUNNER":
-        mcap_stats[m]["out"] += 1
+mcap_stats = _label_stats("mcap")
 
 print(f"  {'MCap':<15} {'Picks':>6} {'Outrunner%':>11} {'AvgRange%':>10}")
 print(f"  {'─'*15} {'─'*6} {'─'*11} {'─'*10}")
-for m, s in sorted(mcap_stats.items(), key=lambda x: x[1]["out"]/max(x[1]["total"],1), reverse=True):
-    ar = sum(s["ranges"]) / len(s["ranges"]) if s["ranges"] else 0
-    print(f"  {m:<15} {s['total']:>6} {s['out']/s['total']*100:>10.1f}% {ar:>10.2f}")
+for s in mcap_stats.itertuples():
+    print(f"  {s.Index:<15} {s.total:>6} {s.out/s.total*100:>10.1f}% {s.avg_range:>10.2f}")
 
 print()
 
@@ -359,20 +378,12 @@ print("─" * 70)
 print("  6. SECTOR → OUTRUNNER RATE (top 10)")
 print("─" * 70)
 
-sec_stats = defaultdict(lambda: {"total": 0, "out": 0, "ranges": []})
-for p in all_picks:
-    sec = p["sector"]
-    sec_stats[sec]["total"] += 1
-    sec_stats[sec]["ranges"].append(p["range_pct"])
-    if p["label"] == "OUTRUNNER":
-        sec_stats[sec]["out"] += 1
+sec_stats = _label_stats("sector")
 
-ranked = sorted(sec_stats.items(), key=lambda x: x[1]["out"]/max(x[1]["total"],1), reverse=True)
 print(f"  {'Sector':<30} {'Picks':>6} {'Outrunner%':>11} {'AvgRange%':>10}")
 print(f"  {'─'*30} {'─'*6} {'─'*11} {'─'*10}")
-for sec, s in ranked[:10]:
-    ar = sum(s["ranges"]) / len(s["ranges"]) if s["ranges"] else 0
-    print(f"  {sec:<30} {s['total']:>6} {s['out']/s['total']*100:>10.1f}% {ar:>10.2f}")
+for s in sec_stats.head(10).itertuples():
+    print(f"  {s.Index:<30} {s.total:>6} {s.out/s.total*100:>10.1f}% {s.avg_range:>10.2f}")
 
 print()
 
@@ -380,19 +391,19 @@ print()
 print("─" * 70)
 print("  7. SAMPLE OUTRUNNERS (best 10)")
 print("─" * 70)
-best = sorted(outrunners, key=lambda x: x["max_move"], reverse=True)[:10]
+best = outrunners.nlargest(10, "max_move", keep="first")
 print(f"  {'Date':<12} {'Symbol':<12} {'Score':>5} {'OI Trend':<22} {'Up%':>6} {'Down%':>6} {'Range%':>7} {'Close%':>7}")
-for p in best:
-    print(f"  {p['pick_date']:<12} {p['symbol']:<12} {p['score']:>5} {p['oi_trend']:<22} {p['up_move']:>+6.2f} {p['down_move']:>6.2f} {p['range_pct']:>7.2f} {p['close_chg']:>+7.2f}")
+for p in best.itertuples(index=False):
+    print(f"  {p.pick_date:<12} {p.symbol:<12} {p.score:>5} {p.oi_trend:<22} {p.up_move:>+6.2f} {p.down_move:>6.2f} {p.range_pct:>7.2f} {p.close_chg:>+7.2f}")
 
 print()
 print("─" * 70)
 print("  8. SAMPLE DUDS (worst 10)")
 print("─" * 70)
-worst = sorted(duds, key=lambda x: x["max_move"])[:10]
+worst = duds.nsmallest(10, "max_move", keep="first")
 print(f"  {'Date':<12} {'Symbol':<12} {'Score':>5} {'OI Trend':<22} {'Up%':>6} {'Down%':>6} {'Range%':>7} {'Close%':>7}")
-for p in worst:
-    print(f"  {p['pick_date']:<12} {p['symbol']:<12} {p['score']:>5} {p['oi_trend']:<22} {p['up_move']:>+6.2f} {p['down_move']:>6.2f} {p['range_pct']:>7.2f} {p['close_chg']:>+7.2f}")
+for p in worst.itertuples(index=False):
+    print(f"  {p.pick_date:<12} {p.symbol:<12} {p.score:>5} {p.oi_trend:<22} {p.up_move:>+6.2f} {p.down_move:>6.2f} {p.range_pct:>7.2f} {p.close_chg:>+7.2f}")
 
 print()
 
@@ -420,51 +431,50 @@ print()
 print("  KEY FINDINGS:")
 print()
 
-# Best OI trend
-best_trend = max(trend_stats.items(), key=lambda x: x[1]["out"]/max(x[1]["total"],1))
-if best_trend[1]["total"] >= 5:
-    pct = best_trend[1]["out"] / best_trend[1]["total"] * 100
-    print(f"  - Best OI Trend:  {best_trend[0]}  ({pct:.0f}% outrunner rate)")
-
-# Best mcap
-best_mcap = max(mcap_stats.items(), key=lambda x: x[1]["out"]/max(x[1]["total"],1))
-if best_mcap[1]["total"] >= 5:
-    pct = best_mcap[1]["out"] / best_mcap[1]["total"] * 100
-    print(f"  - Best MCap:      {best_mcap[0]}  ({pct:.0f}% outrunner rate)")
-
-# Volume threshold
-high_vol = [p for p in all_picks if p["vol_times"] >= 1.5]
-low_vol  = [p for p in all_picks if p["vol_times"] < 1.0]
-if high_vol and low_vol:
-    hv_out = sum(1 for p in high_vol if p["label"] == "OUTRUNNER") / len(high_vol) * 100
-    lv_out = sum(1 for p in low_vol if p["label"] == "OUTRUNNER") / len(low_vol) * 100
+# Best OI trend / mcap — the stats frames are already sorted by
+# outrunner rate, so the best bucket is the first row
+best_trend = trend_stats.iloc[0]
+if best_trend["total"] >= 5:
+    print(f"  - Best OI Trend:  {best_trend.name}  ({best_trend['out_rate']*100:.0f}% outrunner rate)")
+
+best_mcap = mcap_stats.iloc[0]
+if best_mcap["total"] >= 5:
+    print(f"  - Best MCap:      {best_mcap.name}  ({best_mcap['out_rate']*100:.0f}% outrunner rate)")
+
+# Threshold cuts: boolean masks over the picks frame; the outrunner rate
+# of a cut is just the mean of is_out under the mask
+high_vol = picks_df[picks_df["vol_times"] >= 1.5]
+low_vol  = picks_df[picks_df["vol_times"] < 1.0]
+if len(high_vol) and len(low_vol):
+    hv_out = high_vol["is_out"].mean() * 100
+    lv_out = low_vol["is_out"].mean() * 100
     print(f"  - Vol ≥1.5x:      {hv_out:.0f}% outrunner rate  ({len(high_vol)} picks)")
     print(f"  - Vol <1.0x:      {lv_out:.0f}% outrunner rate  ({len(low_vol)} picks)")
 
 # Delivery threshold
-high_dlv = [p for p in all_picks if p["dlv_times"] >= 1.5]
-low_dlv  = [p for p in all_picks if p["dlv_times"] < 1.0]
-if high_dlv and low_dlv:
-    hd_out = sum(1 for p in high_dlv if p["label"] == "OUTRUNNER") / len(high_dlv) * 100
-    ld_out = sum(1 for p in low_dlv if p["label"] == "OUTRUNNER") / len(low_dlv) * 100
+high_dlv = picks_df[picks_df["dlv_times"] >= 1.5]
+low_dlv  = picks_df[picks_df["dlv_times"] < 1.0]
+if len(high_dlv) and len(low_dlv):
+    hd_out = high_dlv["is_out"].mean() * 100
+    ld_out = low_dlv["is_out"].mean() * 100
     print(f"  - Dlv ≥1.5x:      {hd_out:.0f}% outrunner rate  ({len(high_dlv)} picks)")
     print(f"  - Dlv <1.0x:      {ld_out:.0f}% outrunner rate  ({len(low_dlv)} picks)")
 
 # OI change threshold
-high_oi = [p for p in all_picks if p["oi_chg_pct"] >= 5]
-low_oi  = [p for p in all_picks if p["oi_chg_pct"] < 2]
-if high_oi and low_oi:
-    ho_out = sum(1 for p in high_oi if p["label"] == "OUTRUNNER") / len(high_oi) * 100
-    lo_out = sum(1 for p in low_oi if p["label"] == "OUTRUNNER") / len(low_oi) * 100
+high_oi = picks_df[picks_df["oi_chg_pct"] >= 5]
+low_oi  = picks_df[picks_df["oi_chg_pct"] < 2]
+if len(high_oi) and len(low_oi):
+    ho_out = high_oi["is_out"].mean() * 100
+    lo_out = low_oi["is_out"].mean() * 100
     print(f"  - OI Chg ≥5%:     {ho_out:.0f}% outrunner rate  ({len(high_oi)} picks)")
     print(f"  - OI Chg <2%:     {lo_out:.0f}% outrunner rate  ({len(low_oi)} picks)")
 
 # Previous day momentum
-pos_mom = [p for p in all_picks if p["change_pct"] > 1.0]
-neg_mom = [p for p in all_picks if p["change_pct"] < 0]
-if pos_mom and neg_mom:
-    pm_out = sum(1 for p in pos_mom if p["label"] == "OUTRUNNER") / len(pos_mom) * 100
-    nm_out = sum(1 for p in neg_mom if p["label"] == "OUTRUNNER") / len(neg_mom) * 100
+pos_mom = picks_df[picks_df["change_pct"] > 1.0]
+neg_mom = picks_df[picks_df["change_pct"] < 0]
+if len(pos_mom) and len(neg_mom):
+    pm_out = pos_mom["is_out"].mean() * 100
+    nm_out = neg_mom["is_out"].mean() * 100
     print(f"  - Prev chg >1%:   {pm_out:.0f}% outrunner rate  ({len(pos_mom)} picks)")
     print(f"  - Prev chg <0%:   {nm_out:.0f}% outrunner rate  ({len(neg_mom)} picks)")
 
@@ -473,31 +483,30 @@ print("  SUGGESTED FILTERS TO ADD:")
 # Generate dynamic suggestions based on the data
 suggestions = []
 
-if high_vol and low_vol:
-    hv_rate = sum(1 for p in high_vol if p["label"] == "OUTRUNNER") / len(high_vol) * 100
-    lv_rate = sum(1 for p in low_vol if p["label"] == "OUTRUNNER") / len(low_vol) * 100
+if len(high_vol) and len(low_vol):
+    hv_rate = high_vol["is_out"].mean() * 100
+    lv_rate = low_vol["is_out"].mean() * 100
     if hv_rate > lv_rate + 10:
         suggestions.append(f"  - Prefer Volume ≥ 1.5x  (outrunner rate jumps from {lv_rate:.0f}% to {hv_rate:.0f}%)")
 
-if high_dlv and low_dlv:
-    hd_rate = sum(1 for p in high_dlv if p["label"] == "OUTRUNNER") / len(high_dlv) * 100
-    ld_rate = sum(1 for p in low_dlv if p["label"] == "OUTRUNNER") / len(low_dlv) * 100
+if len(high_dlv) and len(low_dlv):
+    hd_rate = high_dlv["is_out"].mean() * 100
+    ld_rate = low_dlv["is_out"].mean() * 100
     if hd_rate > ld_rate + 10:
         suggestions.append(f"  - Prefer Delivery ≥ 1.5x  (outrunner rate jumps from {ld_rate:.0f}% to {hd_rate:.0f}%)")
 
-if high_oi and low_oi:
-    ho_rate = sum(1 for p in high_oi if p["label"] == "OUTRUNNER") / len(high_oi) * 100
-    lo_rate = sum(1 for p in low_oi if p["label"] == "OUTRUNNER") / len(low_oi) * 100
+if len(high_oi) and len(low_oi):
+    ho_rate = high_oi["is_out"].mean() * 100
+    lo_rate = low_oi["is_out"].mean() * 100
     if ho_rate > lo_rate + 10:
         suggestions.append(f"  - Prefer OI Change ≥ 5%  (outrunner rate jumps from {lo_rate:.0f}% to {ho_rate:.0f}%)")
 
 # MCap preference
-for m, s in mcap_stats.items():
+for m, s in mcap_stats.iterrows():
     if s["total"] >= 10:
-        rate = s["out"] / s["total"] * 100
-        ar = sum(s["ranges"]) / len(s["ranges"])
-        if rate >= 70 and ar >= 2.0:
-            suggestions.append(f"  - Focus on {m}  ({rate:.0f}% outrunner, {ar:.1f}% avg range)")
+        rate = s["out_rate"] * 100
+        if rate >= 70 and s["avg_range"] >= 2.0:
+            suggestions.append(f"  - Focus on {m}  ({rate:.0f}% outrunner, {s['avg_range']:.1f}% avg range)")
 
 if suggestions:
     for s in suggestions:
@@ -5,19 +5,18 @@ import pandas as pd
 
 
 def to_line_series(df: pd.DataFrame, time_col: str = "date", value_col: str = "value") -> list[dict]:
-    """Convert DataFrame to [{time, value}] for Lightweight Charts Line/Area series."""
-    return [
-        {"time": str(row[time_col]), "value": float(row[value_col])}
-        for _, row in df.iterrows()
-    ]
+    """Convert DataFrame to [{time, value}] for Lightweight Charts Line/Area series.
+
+    Reads both columns as arrays and zips — iterrows would box every row
+    into a Series just to pull two fields back out."""
+    times = df[time_col].astype(str).to_numpy()
+    values = df[value_col].to_numpy(dtype=float)
+    return [{"time": t, "value": v} for t, v in zip(times, values.tolist())]
 
 
 def to_histogram_series(df: pd.DataFrame, time_col: str = "date", value_col: str = "value") -> list[dict]:
     """Convert DataFrame to [{time, value}] for Lightweight Charts Histogram series."""
-    return [
-        {"time": str(row[time_col]), "value": float(row[value_col])}
-        for _, row in df.iterrows()
-    ]
+    return to_line_series(df, time_col, value_col)
 
 
 def price_to_series(df: pd.DataFrame, date_col: str = "date", close_col: str = "close") -> list[dict]:
@@ -41,7 +40,6 @@ def normalized_price_series(df: pd.DataFrame, date_col: str = "date", close_col:
     if sub.empty or sub[close_col].iloc[0] <= 0:
         return []
     base = float(sub[close_col].iloc[0])
-    return [
-        {"time": str(row[date_col]), "value": round(100 * float(row[close_col]) / base, 2)}
-        for _, row in sub.iterrows()
-    ]
+    times = sub[date_col].astype(str).to_numpy()
+    values = (100 * sub[close_col].astype(float) / base).round(2)
+    return [{"time": t, "value": v} for t, v in zip(times, values.tolist())]
@@ -10,16 +10,37 @@ from core import db
 # ── helpers ──────────────────────────────────────────────────
 
 
+@st.cache_resource
+def _ensure_indexes() -> bool:
+    """Create the indexes backing the per-date queries (once per process;
+    a no-op server-side when they already exist)."""
+    try:
+        db.main_coll().create_index([("date", 1), ("symbol", 1)], background=True)
+        db.main_coll().create_index([("date", 1), ("mcap_category", 1)], background=True)
+    except Exception:
+        # read-only credentials or offline — queries still work, just unindexed
+        pass
+    return True
+
+
+@st.cache_data(ttl=60)
+def _all_dates() -> list[str]:
+    """All distinct dates sorted ascending — one scan, shared by every
+    get_dates() call in the session instead of one per rerun."""
+    _ensure_indexes()
+    dates = db.main_coll().distinct("date")
+    dates.sort()
+    return dates
+
+
 def get_dates(limit: int | None = 60) -> list[str]:
     """Return available dates sorted ascending.
     limit=None → all dates; limit=N → last N dates."""
-    dates = db.main_coll().distinct("date")
-    dates.sort(reverse=True)
-    if limit is not None:
-        dates = dates[:limit]
-    return sorted(dates)
+    dates = _all_dates()
+    return dates if limit is None else dates[-limit:]
 
 
+@st.cache_data(ttl=60)
 def get_latest_date() -> str | None:
     doc = db.main_coll().find_one(sort=[("date", -1)])
     return doc["date"] if doc else None
@@ -29,10 +50,14 @@ def get_symbols() -> list[str]:
     return [s["symbol"] for s in db.summary_coll().find({})]
 
 
+@st.cache_data(ttl=300)
 def get_all_for_date(date: str) -> list[dict]:
-    """All stocks on a given date, field‑mapped."""
+    """All stocks on a given date, field‑mapped and projected down to the
+    fields the dashboard reads."""
     symbols = get_symbols()
-    docs = list(db.main_coll().find({"date": date, "symbol": {"$in": symbols}}))
+    docs = db.main_coll().find(
+        {"date": date, "symbol": {"$in": symbols}}, projection=_SIGNAL_PROJECTION
+    )
     return [db.map_fields(d) for d in docs]
 
 
@@ -41,6 +66,41 @@ def get_stock(symbol: str, date: str) -> dict | None:
     return db.map_fields(doc)
 
 
+# Only the fields the dashboard actually reads (DB names — map_fields
+# renames them app-side). Keeps wire bytes and BSON decode to a minimum.
+_SIGNAL_PROJECTION = {
+    "_id": 0,
+    "date": 1, "symbol": 1, "stock_name": 1, "close": 1, "chg_pct": 1,
+    "put_call_ratio": 1, "pcr_change_1d": 1, "oi_chg_pct": 1,
+    "volume_times": 1, "delivery_times": 1, "oi_trend": 1,
+    "cumulative_future_oi": 1, "cumulative_call_oi": 1, "cumulative_put_oi": 1,
+    "sector_name": 1, "industry_name": 1, "mcap_category": 1, "lot_size": 1,
+}
+
+
+@st.cache_data(ttl=600, persist="disk")
+def _signal_day(date: str) -> dict[str, dict]:
+    """One date's docs, field-mapped: {symbol: doc}. Cached per date and
+    persisted to disk — past dates are immutable, so widening the window
+    (30 → 60 days) only fetches the dates not already in cache, and a
+    restarted worker warms up from disk instead of re-pulling from Atlas.
+    The TTL bounds staleness for the still-mutable latest date."""
+    return {
+        m["symbol"]: m
+        for m in (
+            db.map_fields(doc)
+            for doc in db.main_coll().find({"date": date}, projection=_SIGNAL_PROJECTION)
+        )
+    }
+
+
+def signal_data(dates: list[str]) -> dict[str, dict[str, dict]]:
+    """Signal docs for *dates*, composed from the per-date cache:
+    {date: {symbol: doc}}. Dates with no data are dropped."""
+    out = {d: _signal_day(d) for d in dates}
+    return {d: day for d, day in out.items() if day}
+
+
 def date_df(date: str) -> pd.DataFrame:
     """Return a DataFrame of all stocks for *date*, ready for display."""
     rows = get_all_for_date(date)
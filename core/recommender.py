@@ -1,11 +1,10 @@
 """Outrunner-based recommendation engine — Top 7 picks and Stock Action Sheet."""
 
 from __future__ import annotations
-from core.scorer import base_score, outrunner_conviction, BULLISH
-from core.signals import (
-    signal_convergence,
-    enrich_oi_change_pct,
-)
+import numpy as np
+import pandas as pd
+from core.scorer import base_score_vec, outrunner_conviction_vec
+from core.signals import flatten, signal_convergence, enrich_oi_change_pct_df
 
 
 def get_top_picks(
@@ -26,6 +25,28 @@ def get_top_picks(
     )[:top_n]
 
 
+# Fields carried into each action-sheet row (with defaults for missing input
+# columns), in output order. score/conviction/rec_score/signals are computed.
+_SHEET_COLS = {
+    "symbol": "", "change_pct": None, "volume_times": 0, "delivery_times": 0,
+    "cumulative_future_oi": None, "oi_change_pct": None,
+    "cumulative_call_oi": None, "cumulative_put_oi": None,
+    "pcr": 0, "pcr_change_1d": 0, "oi_trend": "", "mcap_category": "",
+    "sector": "", "industry": "", "lot_size": None,
+    "close": 0, "stock_name": "",
+}
+
+_SHEET_OUT_COLS = [
+    "symbol", "conviction", "score", "rec_score", "signals",
+    "change_pct", "volume_times", "delivery_times",
+    "cumulative_future_oi", "oi_change_pct",
+    "cumulative_call_oi", "cumulative_put_oi",
+    "call_oi_change_pct", "put_oi_change_pct",
+    "pcr", "pcr_change_1d", "oi_trend", "mcap_category",
+    "sector", "industry", "lot_size", "close", "stock_name",
+]
+
+
 def get_action_sheet(
     sig_data: dict,
     dates: list[str],
@@ -36,69 +57,51 @@ def get_action_sheet(
     watchlist: set[str] | None = None,
     sweet_spot_only: bool = False,
 ) -> list[dict]:
-    """Full ranked list for manual analysis. Outrunner logic: Conviction + Score + Signal boost."""
+    """Full ranked list for manual analysis. Outrunner logic: Conviction +
+    Score + Signal boost. One DataFrame pipeline — scoring, enrichment,
+    filters and ranking are columnar instead of a per-stock Python loop."""
     if not dates or view_date not in sig_data:
         return []
 
     prev_date = dates[-2] if len(dates) >= 2 else None
     prev_data = sig_data.get(prev_date, {}) if prev_date else {}
     sector_rot = _get_sector_bull_delta(sig_data, dates, view_date, mcap_filter)
+    conv_map = signal_convergence(flatten(sig_data, dates), dates, view_date)
 
-    conv_map = signal_convergence(sig_data, dates, view_date)
-    rows = []
+    df = pd.DataFrame.from_records(list(sig_data[view_date].values()))
+    if df.empty:
+        return []
+    for c, default in _SHEET_COLS.items():
+        if c not in df.columns:
+            df[c] = default
+
+    prev_df = pd.DataFrame.from_records(list(prev_data.values())) if prev_data else None
+    df = enrich_oi_change_pct_df(df, prev_df)
+    df["score"] = base_score_vec(df)
+    df["conviction"] = outrunner_conviction_vec(df)
+
+    # Liquidity floor: skip low-volume names unless PCR is bullish
+    vol = pd.to_numeric(df["volume_times"], errors="coerce").fillna(0)
+    pcr = pd.to_numeric(df["pcr"], errors="coerce").fillna(1)
+    keep = ~((vol < 0.7) & (pcr >= 1))
+    if mcap_filter != "All":
+        keep &= df["mcap_category"] == mcap_filter
+    if sweet_spot_only:
+        keep &= (df["score"] >= 20) & (df["score"] <= 34)
+    keep &= (df["conviction"] >= min_conv) & (df["score"] >= min_score)
+    if watchlist:
+        keep &= df["symbol"].isin(watchlist)
+    df = df[keep].copy()
+    if df.empty:
+        return []
 
-    for sym, s in sig_data.get(view_date, {}).items():
-        if mcap_filter != "All" and s.get("mcap_category") != mcap_filter:
-            continue
-        vol = s.get("volume_times", 0)
-        pcr = s.get("pcr", 1)
-        if vol < 0.7 and pcr >= 1:
-            continue
-        sc = base_score(s)
-        if sweet_spot_only and (sc < 20 or sc > 34):
-            continue
-        s_enriched = enrich_oi_change_pct(s, prev_data.get(sym))
-        cv = outrunner_conviction(s_enriched)
-        conv = cv["conviction"]
-        if conv < min_conv or sc < min_score:
-            continue
-        if watchlist and sym not in watchlist:
-            continue
+    df["signals"] = df["symbol"].map(lambda s: conv_map.get(s, []))
+    sector_dir = df["sector"].fillna("?").map(lambda sec: sector_rot.get(sec, 0))
+    sector_bonus = np.select([sector_dir > 0.3, sector_dir >= 0], [3, 1], 0)
+    df["rec_score"] = df["conviction"] + df["score"] + df["signals"].str.len() * 2 + sector_bonus
 
-        signals = conv_map.get(sym, [])
-        sector_dir_score = sector_rot.get(s.get("sector", "?"), 0)
-        sector_bonus = 3 if sector_dir_score > 0.3 else (1 if sector_dir_score >= 0 else 0)
-        conv_bonus = len(signals) * 2
-        rec_score = conv + sc + conv_bonus + sector_bonus
-
-        rows.append({
-            "symbol": sym,
-            "conviction": conv,
-            "score": sc,
-            "rec_score": rec_score,
-            "signals": signals,
-            "change_pct": s.get("change_pct"),
-            "volume_times": s.get("volume_times", 0),
-            "delivery_times": s.get("delivery_times", 0),
-            "cumulative_future_oi": s.get("cumulative_future_oi"),
-            "oi_change_pct": s.get("oi_change_pct"),
-            "cumulative_call_oi": s.get("cumulative_call_oi"),
-            "cumulative_put_oi": s.get("cumulative_put_oi"),
-            "call_oi_change_pct": s_enriched.get("call_oi_change_pct"),
-            "put_oi_change_pct": s_enriched.get("put_oi_change_pct"),
-            "pcr": s.get("pcr", 0),
-            "pcr_change_1d": s.get("pcr_change_1d", 0),
-            "oi_trend": s.get("oi_trend", ""),
-            "mcap_category": s.get("mcap_category", ""),
-            "sector": s.get("sector", ""),
-            "industry": s.get("industry", ""),
-            "lot_size": s.get("lot_size"),
-            "close": s.get("close", 0),
-            "stock_name": s.get("stock_name", ""),
-        })
-
-    rows.sort(key=lambda x: (x["rec_score"], x["conviction"], x["score"]), reverse=True)
-    return rows
+    df = df.sort_values(["rec_score", "conviction", "score"], ascending=False, kind="stable")
+    return df[_SHEET_OUT_COLS].to_dict("records")
 
 
 def _get_sector_bull_delta(
@@ -111,7 +114,8 @@ def _get_sector_bull_delta(
     from core.signals import sector_rotation
     if len(dates) < 2:
         return {}
-    rot = sector_rotation(sig_data, dates, window=5, mcap_filter=mcap_filter)
+    rot = sector_rotation(sig_data, dates, window=5, mcap_filter=mcap_filter,
+                          include_stocks=False)
     return {r["Sector"]: r.get("direction_score", 0) for r in rot}
 
 
@@ -119,6 +123,7 @@ def get_historical_top7_performance(
     sig_data: dict,
     dates: list[str],
     lookback_days: int = 5,
+    detail_limit: int = 10,
 ) -> dict | None:
     """Compute last week's Top 7 performance (close-to-close). Returns dict or None."""
     if len(dates) < lookback_days + 1:
@@ -152,7 +157,9 @@ def get_historical_top7_performance(
             if pct > 0:
                 total_green += 1
             chg_sum += pct
-            details.append({"date": dt, "symbol": sym, "pnl_pct": round(pct, 2)})
+            # bounded upstream — callers only ever show the first few
+            if len(details) < detail_limit:
+                details.append({"date": dt, "symbol": sym, "pnl_pct": round(pct, 2)})
 
     if total_picks == 0:
         return None
@@ -161,5 +168,5 @@ def get_historical_top7_performance(
         "green_count": total_green,
         "green_pct": round(total_green / total_picks * 100, 0),
         "avg_chg_pct": round(chg_sum / total_picks, 2),
-        "details": details[:10],
+        "details": details,
     }
@@ -1,6 +1,9 @@
 """Scoring engine + outrunner conviction."""
 
 from __future__ import annotations
+import functools
+import numpy as np
+import pandas as pd
 
 BULLISH = {"NewLong", "ShortCover"}
 
@@ -12,11 +15,21 @@ OI_SCORES = {
 
 
 def base_score(s: dict) -> int:
-    """Compute composite score for one stock dict (mapped fields)."""
-    sc = OI_SCORES.get(s.get("oi_trend", ""), 0)
+    """Compute composite score for one stock dict (mapped fields).
+    Memoized on the underlying primitives — each (symbol, date) row is
+    scored once per process, not once per rerun."""
+    return _base_score_cached(
+        s.get("oi_trend", ""), s.get("pcr", 0), s.get("pcr_change_1d", 0),
+        s.get("oi_change_pct", 0), s.get("volume_times", 0),
+        s.get("delivery_times", 0), s.get("change_pct", 0),
+    )
+
+
+@functools.lru_cache(maxsize=50_000)
+def _base_score_cached(trend: str, pcr: float, pcr_chg: float, oi: float,
+                       vol: float, dlv: float, chg: float) -> int:
+    sc = OI_SCORES.get(trend, 0)
 
-    pcr = s.get("pcr", 0)
-    pcr_chg = s.get("pcr_change_1d", 0)
     if pcr < 0.7:      sc += 7
     elif pcr <= 0.9:    sc += 6
     elif pcr <= 1.0:    sc += 3
@@ -25,28 +38,24 @@ def base_score(s: dict) -> int:
     elif pcr_chg < -0.1: sc += 3
     elif pcr_chg < 0 and pcr < 1.0: sc += 2
 
-    oi = s.get("oi_change_pct", 0)
     if   oi > 10: sc += 8
     elif oi > 5:  sc += 5
     elif oi > 2:  sc += 3
     elif oi > 0:  sc += 1
     elif oi <= -5: sc -= 3
 
-    vol = s.get("volume_times", 0)
     if   vol > 2.0: sc += 5
     elif vol > 1.5: sc += 4
     elif vol > 1.2: sc += 2
     elif vol > 1.0: sc += 1
     elif vol <= 0.7: sc -= 2
 
-    dlv = s.get("delivery_times", 0)
     if   dlv > 2.0: sc += 7
     elif dlv > 1.5: sc += 5
     elif dlv > 1.2: sc += 3
     elif dlv > 1.0: sc += 2
     elif dlv <= 0.7: sc -= 2
 
-    chg = s.get("change_pct", 0)
     if   chg > 3:   sc += 5
     elif chg > 1:   sc += 2
     elif chg > -1:  sc += 0
@@ -201,6 +210,92 @@ def outrunner_conviction(s: dict) -> dict:
     return {"conviction": conv, "max_conviction": 19, "reasons": reasons}
 
 
+@functools.lru_cache(maxsize=50_000)
+def _conviction_cached(trend: str, mcap: str, vol: float, dlv: float,
+                       chg: float, pcr: float, pcr_chg: float, oi: float) -> int:
+    return outrunner_conviction({
+        "oi_trend": trend, "mcap_category": mcap,
+        "volume_times": vol, "delivery_times": dlv, "change_pct": chg,
+        "pcr": pcr, "pcr_change_1d": pcr_chg, "oi_change_pct": oi,
+    })["conviction"]
+
+
+def conviction_score(s: dict) -> int:
+    """Conviction number only (no reason strings), memoized on the underlying
+    primitives — repeated renders of the same rows skip the branch logic."""
+    return _conviction_cached(
+        s.get("oi_trend", ""), s.get("mcap_category", ""),
+        s.get("volume_times", 0), s.get("delivery_times", 0),
+        s.get("change_pct", 0), s.get("pcr", 1),
+        s.get("pcr_change_1d", 0), s.get("oi_change_pct", 0),
+    )
+
+
+def _num_col(df: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    if name in df.columns:
+        return pd.to_numeric(df[name], errors="coerce").fillna(default).to_numpy()
+    return np.full(len(df), default, dtype=float)
+
+
+def _str_col(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name in df.columns:
+        # astype(object) first: fillna("") on a categorical column raises
+        # when "" is not among the categories (null docs become NaN there)
+        return df[name].astype(object).fillna("").to_numpy(dtype=object)
+    return np.full(len(df), "", dtype=object)
+
+
+def outrunner_conviction_vec(df: pd.DataFrame) -> pd.Series:
+    """Batched conviction score for a frame of stock rows — same weights as
+    outrunner_conviction, computed with NumPy selects instead of one Python
+    call per stock. Returns just the score (no reason strings)."""
+    trend = _str_col(df, "oi_trend")
+    mcap = _str_col(df, "mcap_category")
+    vol = _num_col(df, "volume_times", 0)
+    dlv = _num_col(df, "delivery_times", 0)
+    chg = _num_col(df, "change_pct", 0)
+    pcr = _num_col(df, "pcr", 1)
+    pcr_chg = _num_col(df, "pcr_change_1d", 0)
+    oi = _num_col(df, "oi_change_pct", 0)
+
+    conv = (
+        np.select([trend == "ShortCover", trend == "NewLong"], [4, 3], 0)
+        + np.select([mcap == "Mid Cap", mcap == "Large Cap", mcap == "Small Cap"], [3, 1, 1], 0)
+        + np.select([vol >= 2.0, vol >= 1.5, vol >= 1.0], [3, 2, 1], 0)
+        + np.select([dlv >= 2.0, dlv >= 1.5, dlv >= 1.0], [3, 2, 1], 0)
+        + np.select([chg >= 3.0, chg >= 1.0, chg >= 0], [3, 2, 1], 0)
+        + np.select([(pcr < 0.7) & (pcr_chg < 0), pcr < 0.9], [2, 1], 0)
+        + np.where(oi >= 5, 1, 0)
+    )
+    return pd.Series(conv, index=df.index, name="conviction")
+
+
+def base_score_vec(df: pd.DataFrame) -> pd.Series:
+    """Batched base_score for a frame of stock rows — same branch ladder as
+    the scalar version, expressed as NumPy selects (first matching condition
+    wins, exactly like the elif chain)."""
+    trend = _str_col(df, "oi_trend")
+    pcr = _num_col(df, "pcr", 0)
+    pcr_chg = _num_col(df, "pcr_change_1d", 0)
+    oi = _num_col(df, "oi_change_pct", 0)
+    vol = _num_col(df, "volume_times", 0)
+    dlv = _num_col(df, "delivery_times", 0)
+    chg = _num_col(df, "change_pct", 0)
+
+    trends = list(OI_SCORES)
+    sc = (
+        np.select([trend == t for t in trends], [OI_SCORES[t] for t in trends], 0)
+        + np.select([pcr < 0.7, pcr <= 0.9, pcr <= 1.0, pcr > 1.2], [7, 6, 3, -3], 0)
+        + np.select([pcr_chg > 0.1, pcr_chg < -0.1, (pcr_chg < 0) & (pcr < 1.0)], [-3, 3, 2], 0)
+        + np.select([oi > 10, oi > 5, oi > 2, oi > 0, oi <= -5], [8, 5, 3, 1, -3], 0)
+        + np.select([vol > 2.0, vol > 1.5, vol > 1.2, vol > 1.0, vol <= 0.7], [5, 4, 2, 1, -2], 0)
+        + np.select([dlv > 2.0, dlv > 1.5, dlv > 1.2, dlv > 1.0, dlv <= 0.7], [7, 5, 3, 2, -2], 0)
+        + np.select([chg > 3, chg > 1, chg > -1, chg > -3], [5, 2, 0, -1], -3)
+        + np.where((pcr < 1.0) & (vol > 1.0) & (dlv > 1.0) & (chg > 0), 2, 0)
+    )
+    return pd.Series(sc, index=df.index, name="score")
+
+
 def trade_suggestion(s: dict) -> dict:
     """Suggest trade type: Calls, Puts, or Straddle/Strangle.
     Based on outrunner backtest — direction only 38% correct on close,
@@ -2,14 +2,79 @@
 delivery spikes, multi-day streaks."""
 
 from __future__ import annotations
-from collections import defaultdict
 import pandas as pd
-from core.scorer import base_score, outrunner_conviction, BULLISH
+from core.scorer import base_score, base_score_vec, conviction_score, outrunner_conviction_vec, BULLISH
 
 # ── OI Trend Flip Detection ────────────────────────────────
 
 BEARISH_TRENDS = {"NewShort", "LongCover"}
 
+# Columns carried in the flattened alert frame (see flatten()).
+_FLAT_COLS = [
+    "oi_trend", "pcr", "pcr_change_1d", "close", "change_pct",
+    "volume_times", "delivery_times", "oi_change_pct",
+    "cumulative_future_oi", "cumulative_call_oi", "cumulative_put_oi",
+    "sector", "mcap_category",
+]
+
+_FLAT_DEFAULTS = {
+    "oi_trend": "", "sector": "", "mcap_category": "",
+    "pcr_change_1d": 0, "close": 0, "change_pct": 0,
+    "volume_times": 0, "delivery_times": 0, "oi_change_pct": 0,
+    # pcr stays NaN when missing: the score/conviction kernels apply their
+    # own per-consumer defaults (0 and 1), and NaN compares False against
+    # both extreme thresholds, so missing data never shows up as a
+    # PCR-extreme alert or a convergence badge
+    "pcr": None,
+}
+
+# Repeated-string columns stored as category dtype: .isin()/== compare
+# integer codes instead of hashing Python strings, and memory drops to
+# one code per row. Categories are inferred per frame so unexpected
+# trend labels survive instead of becoming NaN under a fixed dtype.
+# score is a small integer (±~40) — int16 halves transport to the browser.
+# The float columns deliberately stay float64: the scoring/conviction
+# kernels compare them against 1- and 2-decimal thresholds (0.7, 1.2, …)
+# and a float32 round-trip can flip exact-boundary values to the other
+# side of the branch, diverging from the scalar scorers.
+_FLAT_DTYPES = {"oi_trend": "category", "sector": "category",
+                      "mcap_category": "category", "score": "int16"}
+
+
+def flatten(data: dict, dates: list[str]) -> pd.DataFrame:
+    """Flatten {date: {symbol: doc}} into one long DataFrame indexed by
+    (date, symbol), with score precomputed. Built in a single pass and
+    shared by all alert detectors so each one is just boolean indexing."""
+    index = []
+    rows = []
+    for d in dates:
+        for sym, s in data.get(d, {}).items():
+            index.append((d, sym))
+            rows.append({c: s.get(c, _FLAT_DEFAULTS.get(c)) for c in _FLAT_COLS})
+    if not rows:
+        return pd.DataFrame(
+            columns=_FLAT_COLS + ["score"],
+            index=pd.MultiIndex.from_arrays([[], []], names=["date", "symbol"]),
+        )
+    df = pd.DataFrame(
+        rows, index=pd.MultiIndex.from_tuples(index, names=["date", "symbol"])
+    )
+    # one vectorized pass instead of a base_score() call per row
+    df["score"] = base_score_vec(df)
+    return df.astype(_FLAT_DTYPES)
+
+
+def _day(df: pd.DataFrame, date: str) -> pd.DataFrame:
+    """Rows for one date, indexed by symbol (empty frame if absent)."""
+    if df.empty or date not in df.index.get_level_values("date"):
+        return df.iloc[0:0].droplevel("date")
+    return df.loc[date]
+
+
+def _symbols(alerts: pd.DataFrame) -> set[str]:
+    """Symbol set of an alert frame (tolerates the bare-empty frame)."""
+    return set(alerts["symbol"]) if "symbol" in alerts.columns else set()
+
 
 def compute_sector_direction(now: dict, past: dict, prev: dict,
                              chg_delta: float, agg_call_chg: float | None,
@@ -86,43 +151,110 @@ def enrich_oi_change_pct(stock: dict, prev_stock: dict | None) -> dict:
     return s
 
 
-def detect_trend_flips(data: dict, dates: list[str]) -> list[dict]:
-    """Find stocks whose OI trend flipped from bearish→bullish today."""
-    if len(dates) < 2:
-        return []
+def enrich_oi_change_pct_df(curr: pd.DataFrame, prev: pd.DataFrame | None) -> pd.DataFrame:
+    """Frame version of enrich_oi_change_pct: one merge on symbol and two
+    vector divides instead of a Python call per stock. Rows without a
+    previous-day match (or with zero previous OI) get NaN."""
+    out = curr.copy()
+    if prev is None or prev.empty or "symbol" not in prev.columns or "symbol" not in out.columns:
+        out["call_oi_change_pct"] = None
+        out["put_oi_change_pct"] = None
+        return out
+    cols = ["cumulative_call_oi", "cumulative_put_oi"]
+    p = prev.reindex(columns=["symbol"] + cols).drop_duplicates("symbol")
+    m = out.reindex(columns=["symbol"] + cols).merge(
+        p, on="symbol", how="left", suffixes=("", "_prev")
+    )
+    for col, dst in [("cumulative_call_oi", "call_oi_change_pct"),
+                     ("cumulative_put_oi", "put_oi_change_pct")]:
+        prev_v = pd.to_numeric(m[f"{col}_prev"], errors="coerce")
+        curr_v = pd.to_numeric(m[col], errors="coerce").fillna(0)
+        chg = (curr_v - prev_v) / prev_v.where(prev_v != 0) * 100
+        out[dst] = chg.round(2).to_numpy()
+    return out
+
+
+def detect_trend_flips(df: pd.DataFrame, dates: list[str]) -> pd.DataFrame:
+    """Find stocks whose OI trend flipped from bearish→bullish today.
+    *df* is the flattened alert frame from flatten(); the result is a
+    projected frame with symbol as a column (no dict round-trip)."""
+    if len(dates) < 2 or df.empty:
+        return pd.DataFrame()
     today, yesterday = dates[-1], dates[-2]
-    flips = []
-    for sym, s_today in data.get(today, {}).items():
-        s_yest = data.get(yesterday, {}).get(sym)
-        if not s_yest:
-            continue
-        t_today = s_today.get("oi_trend", "")
-        t_yest = s_yest.get("oi_trend", "")
-        if t_yest in BEARISH_TRENDS and t_today in BULLISH:
-            flips.append({
-                "symbol": sym,
-                "prev_trend": t_yest,
-                "new_trend": t_today,
-                "close": s_today.get("close", 0),
-                "change_pct": s_today.get("change_pct", 0),
-                "pcr": s_today.get("pcr", 0),
-                "volume_times": s_today.get("volume_times", 0),
-                "delivery_times": s_today.get("delivery_times", 0),
-                "sector": s_today.get("sector", ""),
-                "mcap_category": s_today.get("mcap_category", ""),
-                "score": base_score(s_today),
-                "conviction": outrunner_conviction(s_today)["conviction"],
-            })
-    flips.sort(key=lambda x: x["conviction"], reverse=True)
-    return flips
+    t_day = _day(df, today)
+    y_trend = _day(df, yesterday)["oi_trend"].reindex(t_day.index)
+    mask = (y_trend.isin(BEARISH_TRENDS) & t_day["oi_trend"].isin(BULLISH)).to_numpy()
+    flipped = t_day[mask].reset_index()
+    flipped["prev_trend"] = y_trend.to_numpy()[mask]
+    flipped["new_trend"] = flipped["oi_trend"]
+    flipped["conviction"] = outrunner_conviction_vec(flipped)
+    return flipped.sort_values("conviction", ascending=False, kind="stable")
 
 
 # ── Sector Rotation Tracker ─────────────────────────────────
 
+# Columns (with defaults) carried into each sector's drill-down stock list.
+_STOCK_LIST_COLS = {
+    "symbol": "", "change_pct": 0, "oi_trend": "", "pcr": 0,
+    "volume_times": 0, "delivery_times": 0, "score": 0,
+    "cumulative_call_oi": None, "cumulative_put_oi": None,
+    "cumulative_future_oi": None, "oi_change_pct": 0,
+    "call_oi_change_pct": None, "put_oi_change_pct": None,
+    "pcr_change_1d": 0, "mcap_category": "",
+}
+
+# Numeric inputs to the per-sector aggregates below.
+_STAT_NUM_COLS = [
+    "change_pct", "pcr", "volume_times", "delivery_times",
+    "oi_change_pct", "cumulative_call_oi", "cumulative_put_oi",
+]
+
+
+def _sector_stats(stocks: list[dict]) -> dict[str, dict]:
+    """Per-sector aggregates computed in one groupby pass — the per-stock
+    work happens in C; Python only touches the ~20 sector rows."""
+    if not stocks:
+        return {}
+    df = pd.DataFrame.from_records(stocks)
+    for c in _STAT_NUM_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+        else:
+            df[c] = 0.0
+    df["sector"] = df.get("sector", pd.Series("?", index=df.index)).fillna("?")
+    df["bull"] = df.get("oi_trend", pd.Series("", index=df.index)).isin(BULLISH)
+    agg = df.groupby("sector", sort=False).agg(
+        count=("bull", "size"), bull=("bull", "sum"),
+        avg_chg=("change_pct", "mean"), avg_pcr=("pcr", "mean"),
+        avg_vol=("volume_times", "mean"), avg_dlv=("delivery_times", "mean"),
+        avg_oi_chg=("oi_change_pct", "mean"),
+        call_oi_sum=("cumulative_call_oi", "sum"),
+        put_oi_sum=("cumulative_put_oi", "sum"),
+    )
+    result = {}
+    for sec, r in agg.iterrows():
+        n = int(r["count"])
+        result[sec] = {
+            "count": n,
+            "bull_pct": round(r["bull"] / n * 100, 1),
+            "avg_chg": round(r["avg_chg"], 2),
+            "avg_pcr": round(r["avg_pcr"], 2),
+            "avg_vol": round(r["avg_vol"], 2),
+            "avg_dlv": round(r["avg_dlv"], 2),
+            "avg_oi_chg": round(r["avg_oi_chg"], 2),
+            "call_oi_sum": r["call_oi_sum"],
+            "put_oi_sum": r["put_oi_sum"],
+        }
+    return result
+
+
 def sector_rotation(data: dict, dates: list[str], window: int = 5,
-                    mcap_filter: str = "All") -> list[dict]:
+                    mcap_filter: str = "All",
+                    include_stocks: bool = True) -> list[dict]:
     """Full sector dashboard: OI, PCR, volume, delivery, price change
-    compared over *window* days, optionally filtered by MCap."""
+    compared over *window* days, optionally filtered by MCap.
+    include_stocks=False skips building the per-sector drill-down lists
+    for callers that only need the aggregate rows."""
     if len(dates) < 2:
         return []
     if window == 0:
@@ -136,71 +268,25 @@ def sector_rotation(data: dict, dates: list[str], window: int = 5,
             items = [s for s in items if s.get("mcap_category") == mcap_filter]
         return list(items)
 
-    def _sector_stats(stocks):
-        by_sec = defaultdict(lambda: {
-            "count": 0, "bull": 0,
-            "chg_sum": 0, "pcr_sum": 0, "vol_sum": 0, "dlv_sum": 0,
-            "oi_chg_sum": 0, "call_oi_sum": 0, "put_oi_sum": 0,
-        })
-        for s in stocks:
-            sec = s.get("sector", "?")
-            d = by_sec[sec]
-            d["count"] += 1
-            if s.get("oi_trend", "") in BULLISH:
-                d["bull"] += 1
-            d["chg_sum"] += s.get("change_pct", 0)
-            d["pcr_sum"] += s.get("pcr", 0)
-            d["vol_sum"] += s.get("volume_times", 0)
-            d["dlv_sum"] += s.get("delivery_times", 0)
-            d["oi_chg_sum"] += s.get("oi_change_pct", 0)
-            d["call_oi_sum"] += s.get("cumulative_call_oi") or 0
-            d["put_oi_sum"] += s.get("cumulative_put_oi") or 0
-        result = {}
-        for sec, d in by_sec.items():
-            n = d["count"]
-            if n == 0:
-                continue
-            result[sec] = {
-                "count": n,
-                "bull_pct": round(d["bull"] / n * 100, 1),
-                "avg_chg": round(d["chg_sum"] / n, 2),
-                "avg_pcr": round(d["pcr_sum"] / n, 2),
-                "avg_vol": round(d["vol_sum"] / n, 2),
-                "avg_dlv": round(d["dlv_sum"] / n, 2),
-                "avg_oi_chg": round(d["oi_chg_sum"] / n, 2),
-                "call_oi_sum": d["call_oi_sum"],
-                "put_oi_sum": d["put_oi_sum"],
-            }
-        return result
-
     now_stocks = _filter(dates[-1])
     prev_date = dates[-2] if len(dates) >= 2 else None
     prev_data = data.get(prev_date, {}) if prev_date else {}
 
     stats_now = _sector_stats(now_stocks)
-    # Group stocks by sector for drill-down; enrich with computed call/put OI change %
-    sector_stocks: dict[str, list[dict]] = defaultdict(list)
-    for s in now_stocks:
-        prev_s = prev_data.get(s.get("symbol", ""))
-        s_enriched = enrich_oi_change_pct(s, prev_s)
-        sec = s.get("sector", "?")
-        sector_stocks[sec].append({
-            "symbol": s_enriched.get("symbol", ""),
-            "change_pct": s_enriched.get("change_pct", 0),
-            "oi_trend": s_enriched.get("oi_trend", ""),
-            "pcr": s_enriched.get("pcr", 0),
-            "volume_times": s_enriched.get("volume_times", 0),
-            "delivery_times": s_enriched.get("delivery_times", 0),
-            "score": base_score(s_enriched),
-            "cumulative_call_oi": s_enriched.get("cumulative_call_oi"),
-            "cumulative_put_oi": s_enriched.get("cumulative_put_oi"),
-            "cumulative_future_oi": s_enriched.get("cumulative_future_oi"),
-            "oi_change_pct": s_enriched.get("oi_change_pct", 0),
-            "call_oi_change_pct": s_enriched.get("call_oi_change_pct"),
-            "put_oi_change_pct": s_enriched.get("put_oi_change_pct"),
-            "pcr_change_1d": s_enriched.get("pcr_change_1d", 0),
-            "mcap_category": s_enriched.get("mcap_category", ""),
-        })
+    # Group stocks by sector for drill-down; enrich with computed call/put OI
+    # change % — one merge + vectorized score instead of per-stock calls
+    sector_stocks: dict[str, list[dict]] = {}
+    if include_stocks and now_stocks:
+        now_df = pd.DataFrame.from_records(now_stocks)
+        prev_df = pd.DataFrame.from_records(list(prev_data.values())) if prev_data else None
+        enriched = enrich_oi_change_pct_df(now_df, prev_df)
+        enriched["score"] = base_score_vec(enriched)
+        for c, default in _STOCK_LIST_COLS.items():
+            if c not in enriched.columns:
+                enriched[c] = default
+        sec = enriched.get("sector", pd.Series("?", index=enriched.index)).fillna("?")
+        for name, g in enriched.assign(sector=sec).groupby("sector", sort=False):
+            sector_stocks[name] = g[list(_STOCK_LIST_COLS)].to_dict("records")
 
     if window > 0:
         past_idx = max(0, len(dates) - window - 1)
@@ -256,171 +342,131 @@ def sector_rotation(data: dict, dates: list[str], window: int = 5,
 
 def sector_time_series(data: dict, dates: list[str],
                        mcap_filter: str = "All") -> dict[str, pd.DataFrame]:
-    """Per-sector time series for charting. Returns {sector: DataFrame with date, close, volume_times, delivery_times, fut_oi, call_oi, put_oi, pcr, oi_change_pct, change_pct}."""
-    def _filter(date):
-        items = data.get(date, {}).values()
-        if mcap_filter != "All":
-            items = [s for s in items if s.get("mcap_category") == mcap_filter]
-        return list(items)
-
-    by_sector_date: dict[str, dict[str, list]] = defaultdict(lambda: defaultdict(list))
+    """Per-sector time series for charting. Returns {sector: DataFrame with
+    date, close, volume_times, delivery_times, fut_oi, call_oi, put_oi, pcr,
+    oi_change_pct, change_pct}. One (sector, date) groupby instead of a
+    Python accumulation loop over every stock on every date."""
+    frames = []
     for dt in dates:
-        stocks = _filter(dt)
-        for s in stocks:
-            sec = s.get("sector", "?")
-            by_sector_date[sec][dt].append(s)
-
-    result = {}
-    for sec, date_stocks in by_sector_date.items():
-        rows = []
-        for dt in sorted(date_stocks.keys()):
-            stocks = date_stocks[dt]
-            if not stocks:
-                continue
-            n = len(stocks)
-            rows.append({
-                "date": dt,
-                "close": sum(s.get("close", 0) or 0 for s in stocks) / n,
-                "volume_times": sum(s.get("volume_times", 0) or 0 for s in stocks) / n,
-                "delivery_times": sum(s.get("delivery_times", 0) or 0 for s in stocks) / n,
-                "fut_oi": sum(s.get("cumulative_future_oi", 0) or 0 for s in stocks),
-                "call_oi": sum(s.get("cumulative_call_oi", 0) or 0 for s in stocks),
-                "put_oi": sum(s.get("cumulative_put_oi", 0) or 0 for s in stocks),
-                "pcr": sum(s.get("pcr", 0) or 0 for s in stocks) / n,
-                "oi_change_pct": sum(s.get("oi_change_pct", 0) or 0 for s in stocks) / n,
-                "change_pct": sum(s.get("change_pct", 0) or 0 for s in stocks) / n,
-            })
-        if rows:
-            result[sec] = pd.DataFrame(rows)
-    return result
+        day = data.get(dt, {})
+        if day:
+            df = pd.DataFrame.from_records(list(day.values()))
+            df["date"] = dt
+            frames.append(df)
+    if not frames:
+        return {}
+    big = pd.concat(frames, ignore_index=True)
+    if mcap_filter != "All":
+        if "mcap_category" not in big.columns:
+            return {}
+        big = big[big["mcap_category"] == mcap_filter]
+    if big.empty:
+        return {}
+
+    num_cols = ["close", "volume_times", "delivery_times", "pcr",
+                "oi_change_pct", "change_pct", "cumulative_future_oi",
+                "cumulative_call_oi", "cumulative_put_oi"]
+    for c in num_cols:
+        if c in big.columns:
+            big[c] = pd.to_numeric(big[c], errors="coerce").fillna(0)
+        else:
+            big[c] = 0.0
+    big["sector"] = big.get("sector", pd.Series("?", index=big.index)).fillna("?")
+
+    agg = big.groupby(["sector", "date"], sort=False).agg(
+        close=("close", "mean"),
+        volume_times=("volume_times", "mean"),
+        delivery_times=("delivery_times", "mean"),
+        fut_oi=("cumulative_future_oi", "sum"),
+        call_oi=("cumulative_call_oi", "sum"),
+        put_oi=("cumulative_put_oi", "sum"),
+        pcr=("pcr", "mean"),
+        oi_change_pct=("oi_change_pct", "mean"),
+        change_pct=("change_pct", "mean"),
+    ).reset_index()
+    return {
+        sec: g.drop(columns="sector").sort_values("date").reset_index(drop=True)
+        for sec, g in agg.groupby("sector", sort=False)
+    }
 
 
 # ── PCR Extreme Alerts ──────────────────────────────────────
 
-def pcr_extremes(data: dict, date: str,
+def pcr_extremes(df: pd.DataFrame, date: str,
                  low_thresh: float = 0.5, high_thresh: float = 1.5) -> dict:
     """Find stocks at PCR extremes — potential reversal signals."""
-    low, high = [], []
-    for sym, s in data.get(date, {}).items():
-        pcr = s.get("pcr", 1)
-        entry = {
-            "symbol": sym, "pcr": pcr,
-            "pcr_change_1d": s.get("pcr_change_1d", 0),
-            "close": s.get("close", 0),
-            "change_pct": s.get("change_pct", 0),
-            "oi_trend": s.get("oi_trend", ""),
-            "sector": s.get("sector", ""),
-            "mcap_category": s.get("mcap_category", ""),
-        }
-        if pcr <= low_thresh:
-            low.append(entry)
-        elif pcr >= high_thresh:
-            high.append(entry)
-    low.sort(key=lambda x: x["pcr"])
-    high.sort(key=lambda x: x["pcr"], reverse=True)
+    day = _day(df, date)
+    low = day[day["pcr"] <= low_thresh].sort_values("pcr", kind="stable").reset_index()
+    high = day[day["pcr"] >= high_thresh].sort_values("pcr", ascending=False, kind="stable").reset_index()
     return {"low_pcr": low, "high_pcr": high}
 
 
 # ── Delivery Spike Scanner ──────────────────────────────────
 
-def delivery_spikes(data: dict, date: str, thresh: float = 2.0) -> list[dict]:
+def delivery_spikes(df: pd.DataFrame, date: str, thresh: float = 2.0) -> pd.DataFrame:
     """Stocks with delivery ≥ thresh today — institutional buying signal."""
-    spikes = []
-    for sym, s in data.get(date, {}).items():
-        dlv = s.get("delivery_times", 0)
-        if dlv >= thresh:
-            spikes.append({
-                "symbol": sym,
-                "delivery_times": dlv,
-                "volume_times": s.get("volume_times", 0),
-                "close": s.get("close", 0),
-                "change_pct": s.get("change_pct", 0),
-                "oi_trend": s.get("oi_trend", ""),
-                "pcr": s.get("pcr", 0),
-                "sector": s.get("sector", ""),
-                "mcap_category": s.get("mcap_category", ""),
-                "score": base_score(s),
-            })
-    spikes.sort(key=lambda x: x["delivery_times"], reverse=True)
-    return spikes
+    day = _day(df, date)
+    hot = day[day["delivery_times"] >= thresh]
+    return hot.sort_values("delivery_times", ascending=False, kind="stable").reset_index()
 
 
 # ── Multi-Day Score Streak ──────────────────────────────────
 
-def score_streaks(data: dict, dates: list[str],
-                  min_days: int = 3, lo: int = 20, hi: int = 34) -> list[dict]:
+def score_streaks(df: pd.DataFrame, dates: list[str],
+                  min_days: int = 3, lo: int = 20, hi: int = 34) -> pd.DataFrame:
     """Stocks in sweet-spot score range for ≥ min_days consecutive days."""
-    if len(dates) < min_days:
-        return []
+    if len(dates) < min_days or df.empty:
+        return pd.DataFrame()
 
     recent = dates[-min_days:]
-    # count how many of the last min_days each symbol was in range
-    sym_days = defaultdict(int)
-    sym_latest = {}
-    for d in recent:
-        for sym, s in data.get(d, {}).items():
-            sc = base_score(s)
-            if lo <= sc <= hi:
-                sym_days[sym] += 1
-                sym_latest[sym] = s
-
-    streaks = []
-    for sym, count in sym_days.items():
-        if count >= min_days:
-            s = sym_latest[sym]
-            streaks.append({
-                "symbol": sym,
-                "streak_days": count,
-                "score": base_score(s),
-                "conviction": outrunner_conviction(s)["conviction"],
-                "close": s.get("close", 0),
-                "change_pct": s.get("change_pct", 0),
-                "oi_trend": s.get("oi_trend", ""),
-                "pcr": s.get("pcr", 0),
-                "volume_times": s.get("volume_times", 0),
-                "delivery_times": s.get("delivery_times", 0),
-                "sector": s.get("sector", ""),
-                "mcap_category": s.get("mcap_category", ""),
-            })
-    streaks.sort(key=lambda x: (x["streak_days"], x["conviction"]), reverse=True)
-    return streaks
+    sub = df[df.index.get_level_values("date").isin(recent)]
+    in_range = sub[(sub["score"] >= lo) & (sub["score"] <= hi)]
+    if in_range.empty:
+        return pd.DataFrame()
+    counts = in_range.groupby(level="symbol").size()
+    qualified = counts[counts >= min_days]
+    # latest in-range row per qualifying symbol (frame is in date order)
+    latest = in_range.groupby(level="symbol").tail(1).droplevel("date")
+    latest = latest.loc[latest.index.intersection(qualified.index)].reset_index()
+    latest["streak_days"] = latest["symbol"].map(qualified).astype(int)
+    latest["conviction"] = outrunner_conviction_vec(latest)
+    return latest.sort_values(["streak_days", "conviction"], ascending=False, kind="stable")
 
 
 # ── Daily Summary Generator ─────────────────────────────────
 
-def daily_summary(data: dict, dates: list[str]) -> str:
+def daily_summary(df: pd.DataFrame, dates: list[str]) -> str:
     """Generate a one-paragraph morning summary."""
     if not dates:
         return "No data available."
     today = dates[-1]
-    stocks = data.get(today, {})
-    if not stocks:
+    day = _day(df, today)
+    if day.empty:
         return "No stock data for today."
 
-    total = len(stocks)
-    n_bull = sum(1 for s in stocks.values() if s.get("oi_trend", "") in BULLISH)
-    n_bear = sum(1 for s in stocks.values() if s.get("oi_trend", "") in BEARISH_TRENDS)
+    total = len(day)
+    n_bull = int(day["oi_trend"].isin(BULLISH).sum())
+    n_bear = int(day["oi_trend"].isin(BEARISH_TRENDS).sum())
     bull_pct = n_bull / total * 100 if total else 0
 
     # Previous day comparison
     prev_bull_pct = 0
     if len(dates) >= 2:
-        yest = data.get(dates[-2], {})
-        if yest:
-            prev_bull_pct = sum(1 for s in yest.values()
-                                if s.get("oi_trend", "") in BULLISH) / len(yest) * 100
+        yest = _day(df, dates[-2])
+        if not yest.empty:
+            prev_bull_pct = yest["oi_trend"].isin(BULLISH).mean() * 100
 
-    avg_pcr = sum(s.get("pcr", 0) for s in stocks.values()) / total
-    avg_chg = sum(s.get("change_pct", 0) for s in stocks.values()) / total
+    avg_pcr = day["pcr"].mean()
+    avg_chg = day["change_pct"].mean()
 
     # Trend flips
-    flips = detect_trend_flips(data, dates)
+    flips = detect_trend_flips(df, dates)
     # PCR extremes
-    ext = pcr_extremes(data, today)
+    ext = pcr_extremes(df, today)
     # Delivery spikes
-    spk = delivery_spikes(data, today, 2.0)
+    spk = delivery_spikes(df, today, 2.0)
     # Streaks
-    stk = score_streaks(data, dates, 3)
+    stk = score_streaks(df, dates, 3)
 
     lines = []
     lines.append(f"**{today}** — {n_bull} bullish ({bull_pct:.0f}%) vs {n_bear} bearish out of {total} stocks.")
@@ -432,17 +478,17 @@ def daily_summary(data: dict, dates: list[str]) -> str:
 
     lines.append(f"Avg PCR: {avg_pcr:.2f}, Avg Change: {avg_chg:+.2f}%.")
 
-    if flips:
-        top_flip = flips[0]
+    if not flips.empty:
+        top_flip = flips.iloc[0]
         lines.append(f"{len(flips)} trend flip(s) detected — top: **{top_flip['symbol']}** ({top_flip['prev_trend']} → {top_flip['new_trend']}).")
 
-    if ext["low_pcr"]:
+    if not ext["low_pcr"].empty:
         lines.append(f"{len(ext['low_pcr'])} stock(s) at PCR extreme low (≤0.5) — put writers very confident.")
 
-    if spk:
+    if not spk.empty:
         lines.append(f"{len(spk)} delivery spike(s) (≥2.0x) — institutional buying detected.")
 
-    if stk:
+    if not stk.empty:
         lines.append(f"{len(stk)} stock(s) on {3}+ day sweet-spot streak — persistent conviction.")
 
     return " ".join(lines)
@@ -451,26 +497,41 @@ def daily_summary(data: dict, dates: list[str]) -> str:
 # ── Signal Convergence (for badges) ────────────────────────────────
 
 def signal_convergence(
-    data: dict,
+    df: pd.DataFrame,
     dates: list[str],
     view_date: str,
 ) -> dict[str, list[str]]:
     """Returns {symbol: [signal1, signal2, ...]} for stocks on view_date.
-    Signals: Flip, PCR, Dlv, Streak, CallPut."""
+    Signals: Flip, PCR, Dlv, Streak, CallPut.
+    *df* is the flattened alert frame from flatten()."""
     result: dict[str, list[str]] = {}
-    if not dates or view_date not in data:
+    day = _day(df, view_date)
+    if not dates or day.empty:
         return result
 
-    flips = {f["symbol"] for f in detect_trend_flips(data, dates)}
-    ext = pcr_extremes(data, view_date)
-    pcr_syms = {e["symbol"] for e in ext["low_pcr"] + ext["high_pcr"]}
-    spikes = {s["symbol"] for s in delivery_spikes(data, view_date, 2.0)}
-    streaks = {s["symbol"] for s in score_streaks(data, dates, 3)}
+    flips = _symbols(detect_trend_flips(df, dates))
+    ext = pcr_extremes(df, view_date)
+    pcr_syms = _symbols(ext["low_pcr"]) | _symbols(ext["high_pcr"])
+    spikes = _symbols(delivery_spikes(df, view_date, 2.0))
+    streaks = _symbols(score_streaks(df, dates, 3))
 
+    # Call/Put divergence — vectorized over the day vs previous day
     prev_date = dates[-2] if len(dates) >= 2 else None
-    prev_data = data.get(prev_date, {}) if prev_date else {}
-
-    for sym, s in data.get(view_date, {}).items():
+    cp_bull: set[str] = set()
+    if prev_date is not None:
+        prev = _day(df, prev_date)
+        if not prev.empty:
+            prev_call = prev["cumulative_call_oi"].reindex(day.index).fillna(0)
+            prev_put = prev["cumulative_put_oi"].reindex(day.index).fillna(0)
+            curr_call = day["cumulative_call_oi"].fillna(0)
+            curr_put = day["cumulative_put_oi"].fillna(0)
+            valid = (prev_call > 0) & (prev_put > 0)
+            call_chg = (curr_call - prev_call) / prev_call.where(valid, 1)
+            put_chg = (curr_put - prev_put) / prev_put.where(valid, 1)
+            bull = valid & (call_chg > 0.02) & (put_chg < -0.02)
+            cp_bull = set(day.index[bull])
+
+    for sym in day.index:
         sigs = []
         if sym in flips:
             sigs.append("Flip")
@@ -480,9 +541,7 @@ def signal_convergence(
             sigs.append("Dlv")
         if sym in streaks:
             sigs.append("Streak")
-        # Call/Put divergence
-        cp = call_put_divergence(s, prev_data.get(sym))
-        if cp == "bullish":
+        if sym in cp_bull:
             sigs.append("CallPut")
         if sigs:
             result[sym] = sigs
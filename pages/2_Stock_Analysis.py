@@ -83,16 +83,21 @@ SERIES_OPTIONS = [
     "Dlv(x)",
     "Call OI vs Put OI",
 ]
-selected_series = st.multiselect(
-    "Select data series",
-    options=SERIES_OPTIONS,
-    default=SERIES_OPTIONS,
-    key="stock_analysis_series",
-)
-
-if not selected_series:
-    st.caption("Select at least one data series above.")
-else:
+
+
+# Fragment: toggling series only rebuilds the figure, not the whole page
+@st.fragment
+def _render_chart(hdf):
+    selected_series = st.multiselect(
+        "Select data series",
+        options=SERIES_OPTIONS,
+        default=SERIES_OPTIONS,
+        key="stock_analysis_series",
+    )
+
+    if not selected_series:
+        st.caption("Select at least one data series above.")
+        return
     n = len(selected_series)
     row_heights = [1.5 if s == "Close" else 0.8 for s in selected_series]
     fig = make_subplots(
@@ -146,6 +151,9 @@ else:
 
     st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
+
+_render_chart(hdf)
+
 # ── Conviction Breakdown (latest) ───────────────────────────
 st.subheader("Current Conviction Breakdown")
 reasons = conv["reasons"]
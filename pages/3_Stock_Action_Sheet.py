@@ -1,11 +1,19 @@
 """Stock Action Sheet — Full ranked list with all available data."""
 
+import bisect
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 from core import loader, recommender
 
 st.set_page_config(page_title="Stock Action Sheet", page_icon="📋", layout="wide")
 
+# Shared link-column config — built (and its regex compiled) once per run
+_SYMBOL_LINK_COL = st.column_config.LinkColumn(
+    "Symbol", display_text=r".*symbol=([^&]+)"
+)
+
 with st.sidebar:
     st.header("Navigation")
     st.page_link("app.py", label="Home", icon="🏠")
@@ -29,20 +37,10 @@ with st.sidebar:
     )
     st.caption(f"Data up to {view_date}")
 
-dates_up_to_view = [d for d in dates if d <= view_date]
+dates_up_to_view = dates[: bisect.bisect_right(dates, view_date)]
 mcap_filter = "All"
 
-@st.cache_data(ttl=300)
-def _signal_data(date_list):
-    from collections import defaultdict
-    from core import db
-    d = defaultdict(dict)
-    for doc in db.main_coll().find({"date": {"$in": date_list}}):
-        m = db.map_fields(doc)
-        d[m["date"]][m["symbol"]] = m
-    return dict(d)
-
-sig_data = _signal_data(tuple(dates))
+sig_data = loader.signal_data(dates)
 
 action_sheet = recommender.get_action_sheet(
     sig_data, dates_up_to_view, view_date,
@@ -90,18 +88,30 @@ if action_sheet:
     fmt.update({c: "{:.2f}" for c in ["Vol(x)", "Dlv(x)", "PCR"] if c in as_df.columns})
     fmt.update({c: "{:,.2f}" for c in ["Close"] if c in as_df.columns})
     fmt.update({c: "{:,.0f}" for c in ["Cum Fut OI", "Cum Call OI", "Cum Put OI", "Lot Size"] if c in as_df.columns})
-    styled = as_df.style.format(fmt, na_rep="—")
-    if chg_cols:
-        def _sc(s):
-            return ["color: #22c55e" if v is not None and isinstance(v, (int, float)) and v > 0
-                    else "color: #ef4444" if v is not None and isinstance(v, (int, float)) and v < 0 else "" for v in s]
-        styled = styled.apply(_sc, subset=chg_cols)
-    if "OI Trend" in as_df.columns:
-        styled = styled.map(lambda v: "background-color: rgba(34,197,94,0.2)" if v in ("NewLong", "ShortCover") else "background-color: rgba(239,68,68,0.2)" if v in ("NewShort", "LongCover") else "", subset=["OI Trend"])
-    for col in ["Vol(x)", "Dlv(x)"]:
-        if col in as_df.columns:
-            styled = styled.map(lambda v: "background-color: rgba(34,197,94,0.3); font-weight: 600" if v is not None and isinstance(v, (int, float)) and v >= 1.5 else "", subset=[col])
+    # One CSS matrix for the whole sheet — NumPy compares per column instead
+    # of a Python lambda per cell (~16 columns × every stock)
+    def _sheet_css(df):
+        out = pd.DataFrame("", index=df.index, columns=df.columns)
+        for c in chg_cols:
+            a = pd.to_numeric(df[c], errors="coerce").to_numpy()
+            out[c] = np.where(a > 0, "color: #22c55e",
+                              np.where(a < 0, "color: #ef4444", ""))
+        if "OI Trend" in df.columns:
+            trend = df["OI Trend"].to_numpy()
+            out["OI Trend"] = np.where(
+                np.isin(trend, ["NewLong", "ShortCover"]),
+                "background-color: rgba(34,197,94,0.2)",
+                np.where(np.isin(trend, ["NewShort", "LongCover"]),
+                         "background-color: rgba(239,68,68,0.2)", ""))
+        for c in ["Vol(x)", "Dlv(x)"]:
+            if c in df.columns:
+                a = pd.to_numeric(df[c], errors="coerce").to_numpy()
+                out[c] = np.where(a >= 1.5,
+                                  "background-color: rgba(34,197,94,0.3); font-weight: 600", "")
+        return out
+
+    styled = as_df.style.format(fmt, na_rep="—").apply(_sheet_css, axis=None)
     st.dataframe(styled, width="stretch", hide_index=True, height=500,
-                 column_config={"Symbol": st.column_config.LinkColumn("Symbol", display_text=r".*symbol=([^&]+)")})
+                 column_config={"Symbol": _SYMBOL_LINK_COL})
 else:
     st.caption("No stocks for this filter.")